@@ -24,19 +24,29 @@ from letter_acceptance_generator import LetterAcceptanceGenerator
 from work_order_generator import WorkOrderGenerator
 from scrutiny_sheet_generator import ScrutinySheetGenerator
 from date_utils import DateUtils
-from pdf_generator import PDFGenerator
+from pdf_generator import get_pdf_generator
 from latex_generator import LaTeXGenerator
 # Add imports for PDF and ZIP generation
 from latex_pdf_generator import LatexPDFGenerator
 from zip_generator import ZipGenerator
+from nit_parse_cache import get_nit_parse_cache
+from nit_document_batch import bidders_by_work, generate_nit_documents
+from bidder_repository import get_bidder_repository
 # Ensure module-level access to ExcelParser
 import excel_parser
+from excel_parser import NIT_FILE_EXTENSIONS
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, 
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
+# Parser diagnostics also go to their own file (the script reruns, so add the handler once)
+_parser_logger = logging.getLogger('excel_parser')
+if not any(isinstance(handler, logging.FileHandler) for handler in _parser_logger.handlers):
+    _parser_log_handler = logging.FileHandler('excel_parser.log', encoding='utf-8')
+    _parser_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _parser_logger.addHandler(_parser_log_handler)
 
 # Page configuration (aligned with reference)
 st.set_page_config(
@@ -49,6 +59,21 @@ st.set_page_config(
 # Apply custom styling
 apply_custom_css()
 
+def read_and_remove(path):
+    """
+    Return the bytes of a temporary archive and delete the file.
+
+    st.download_button keeps its whole payload in memory for the session
+    (a file object is simply read), so archives are handed over as bytes
+    knowingly: building them in a temporary file keeps generation from
+    buffering them, but serving still needs one in-memory copy per ZIP.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
 def main():
     """Main application function."""
     
@@ -170,7 +195,7 @@ def handle_nit_upload():
     with col1:
         uploaded_file = st.file_uploader(
             "Choose NIT Excel file",
-            type=['xlsx', 'xls'],
+            type=list(NIT_FILE_EXTENSIONS),
             help="Upload the official NIT Excel document for enhanced processing"
         )
 
@@ -190,22 +215,14 @@ def handle_nit_upload():
             create_progress_card("Processing NIT Document", 25, "Initializing enhanced parser...")
             
         try:
-            # Simulate enhanced processing with progress updates
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-
             # Update progress
             progress_container.empty()
             with progress_container:
                 create_progress_card("Processing NIT Document", 50, "Parsing Excel data...")
 
-            # Initialize ExcelParser and parse the uploaded file
+            # Parse straight from the upload bytes; unchanged files come from the cache
             parser = excel_parser.ExcelParser()
-            work_data = parser.parse_nit_excel(tmp_file_path)
-
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+            work_data = get_nit_parse_cache().get_or_parse(uploaded_file.getvalue(), parser.parse_nit_excel)
 
             # Update progress
             progress_container.empty() 
@@ -305,13 +322,6 @@ def handle_nit_upload():
             create_status_indicator("error", f"Error processing file: {str(e)}")
             logging.error(f"Error processing NIT file: {e}")
             
-            # Clean up temporary file if it exists
-            if 'tmp_file_path' in locals() and os.path.exists(tmp_file_path):
-                try:
-                    os.unlink(tmp_file_path)
-                except Exception as cleanup_error:
-                    logging.error(f"Error cleaning up temporary file: {cleanup_error}")
-            
             # Show error message to user
             st.error(f"Error processing NIT file: {str(e)}")
             return
@@ -364,7 +374,7 @@ def handle_nit_upload():
     with col1:
         uploaded_file = st.file_uploader(
             "Choose NIT Excel file",
-            type=['xlsx', 'xls'],
+            type=list(NIT_FILE_EXTENSIONS),
             help="Upload the official NIT Excel document for enhanced processing"
         )
 
@@ -384,19 +394,14 @@ def handle_nit_upload():
             create_progress_card("Processing NIT Document", 25, "Initializing enhanced parser...")
             
         try:
-            # Simulate enhanced processing with progress updates
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-
             # Update progress
             progress_container.empty()
             with progress_container:
                 create_progress_card("Processing NIT Document", 50, "Parsing Excel data...")
 
-            # Parse the uploaded Excel file using ExcelParser
+            # Parse straight from the upload bytes; unchanged files come from the cache
             parser = excel_parser.ExcelParser()
-            work_data = parser.parse_nit_excel(tmp_file_path)
+            work_data = get_nit_parse_cache().get_or_parse(uploaded_file.getvalue(), parser.parse_nit_excel)
             
             if not work_data:
                 raise ValueError("No valid work data found in the uploaded file")
@@ -406,9 +411,6 @@ def handle_nit_upload():
             with progress_container:
                 create_progress_card("Processing NIT Document", 100, "Processing complete!")
 
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
-
             if work_data:
                 st.session_state.current_work = work_data
                 
@@ -652,23 +654,15 @@ def handle_nit_upload():
     
     uploaded_file = st.file_uploader(
         "Choose NIT Excel file", 
-        type=['xlsx', 'xls'],
+        type=list(NIT_FILE_EXTENSIONS),
         help="Upload the official NIT Excel document"
     )
     
     if uploaded_file is not None:
         try:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-            
-            # Parse Excel file
+            # Parse straight from the upload bytes; unchanged files come from the cache
             parser = excel_parser.ExcelParser()
-            work_data = parser.parse_nit_excel(tmp_file_path)
-            
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+            work_data = get_nit_parse_cache().get_or_parse(uploaded_file.getvalue(), parser.parse_nit_excel)
             
             if work_data:
                 # Ensure reference-style 'work_info' compatibility for downstream steps
@@ -720,18 +714,16 @@ def handle_bidder_management():
         st.warning("⚠️ Please upload a NIT document first.")
         return
     
-    # Load bidder database
-    bidder_database = {}
+    # Load bidder directory (process-wide cache, reloaded only when the database file changes)
+    bidder_repository = get_bidder_repository()
     try:
-        with open('bidder_database.json', 'r', encoding='utf-8') as f:
-            bidder_database = json.load(f)
+        bidder_database = bidder_repository.get_directory()
+        bidder_options = bidder_repository.get_bidder_options()
     except Exception as e:
         st.error(f"❌ Error loading bidder database: {str(e)}")
         return
     
-    # Get list of available bidders
-    available_bidders = list(bidder_database.keys())
-    st.info(f"📋 Available bidders in database: {len(available_bidders)}")
+    st.info(f"📋 Available bidders in database: {len(bidder_database)}")
     
     # Step 1: Select number of bidders
     st.subheader("📊 Step 1: Select Number of Bidders")
@@ -762,7 +754,7 @@ def handle_bidder_management():
                 # Dropdown to select bidder from database
                 selected_bidder = st.selectbox(
                     f"Select Bidder {i+1}:",
-                    options=[""] + available_bidders,
+                    options=bidder_options,
                     key=f"bidder_select_{i}",
                     help="Choose from registered bidders"
                 )
@@ -821,14 +813,8 @@ def handle_bidder_management():
                 st.session_state.bidders = bidder_data_list
                 
                 # Update bidder database with last used dates
-                for bidder_data in bidder_data_list:
-                    if bidder_data['name'] in bidder_database:
-                        bidder_database[bidder_data['name']]['last_used'] = DateUtils().get_current_date()
-                
-                # Save updated database
                 try:
-                    with open('bidder_database.json', 'w', encoding='utf-8') as f:
-                        json.dump(bidder_database, f, indent=2, ensure_ascii=False)
+                    bidder_repository.touch_bidders(b['name'] for b in bidder_data_list)
                 except Exception as e:
                     st.warning(f"⚠️ Could not update bidder database: {str(e)}")
                 
@@ -921,7 +907,7 @@ def handle_report_generation():
                 status_text = st.empty()
                 
                 # Initialize generators
-                pdf_gen = PDFGenerator()
+                pdf_gen = get_pdf_generator()
                 doc_gen = DocumentGenerator()
                 
                 generated_files = {}
@@ -1036,7 +1022,7 @@ def handle_report_generation():
                 status_text2 = st.empty()
                 
                 # Initialize generators
-                pdf_gen = PDFGenerator()
+                pdf_gen = get_pdf_generator()
                 doc_gen = DocumentGenerator()
                 
                 generated_docs = {}
@@ -1143,6 +1129,72 @@ def handle_report_generation():
                 st.error(f"❌ Error in bulk document generation: {str(e)}")
                 logging.error(f"Error in bulk document generation: {e}")
     
+    # Batch generation for every work of a multi-work NIT
+    works = work_data.get('works') or []
+    if len(works) > 1:
+        st.markdown("---")
+        st.subheader(f"📚 Generate Documents for All {len(works)} Works")
+        st.caption("Edit the quoted percentage of each bidder per work; rows with an empty percentage are ignored.")
+        
+        bidder_table = st.data_editor(
+            pd.DataFrame([
+                {
+                    'item_no': str(work.get('item_no', '')),
+                    'work_name': work.get('name', ''),
+                    'name': bidder['name'],
+                    'address': bidder.get('address', ''),
+                    'percentage': bidder['percentage']
+                }
+                for work in works
+                for bidder in st.session_state.bidders
+            ]),
+            num_rows="dynamic",
+            use_container_width=True,
+            disabled=['work_name'],
+            key="batch_bidder_table"
+        )
+        batch_formats = st.multiselect("Formats", ['pdf', 'docx'], default=['pdf'], key="batch_formats")
+        
+        if st.button("📚 Generate All Works (ZIP)", type="primary"):
+            try:
+                batch_progress = st.progress(0)
+                batch_status = st.empty()
+                
+                def show_batch_progress(done, total, message):
+                    batch_progress.progress(int(100 * done / total) if total else 100)
+                    batch_status.text(f"{message} ({done}/{total})")
+                
+                archive_fd, archive_path = tempfile.mkstemp(suffix='.zip')
+                os.close(archive_fd)
+                try:
+                    result = generate_nit_documents(
+                        work_data,
+                        bidders_by_work(work_data, bidder_table.to_dict('records')),
+                        archive_path,
+                        formats=batch_formats,
+                        progress=show_batch_progress
+                    )
+                finally:
+                    archive_data = read_and_remove(archive_path)
+                
+                st.success(f"✅ Generated {result['documents']} documents for {result['works']} works")
+                if result['skipped']:
+                    st.warning(f"⚠️ Skipped works without bidders: {', '.join(result['skipped'])}")
+                for error in result['errors']:
+                    st.warning(f"⚠️ {error['document']}: {error['error']}")
+                
+                st.download_button(
+                    label="📥 Download All Works ZIP",
+                    data=archive_data,
+                    file_name=f"NIT_{work_data.get('nit_number', 'documents')}_all_works.zip".replace('/', '-'),
+                    mime="application/zip",
+                    key="download_all_works_zip"
+                )
+                
+            except Exception as e:
+                st.error(f"❌ Error in batch document generation: {str(e)}")
+                logging.error(f"Error in batch document generation: {e}")
+    
     # Divider
     st.markdown("---")
     
@@ -1577,6 +1629,8 @@ def handle_document_generation():
                             
                         generated_pdfs = latex_gen.generate_bulk_pdfs(formatted_work_data, valid_bidders)
                         progress_bar.progress(100)
+                        for doc_type, error in latex_gen.last_bulk_errors.items():
+                            st.warning(f"⚠️ {doc_type.replace('_', ' ')} failed: {error}")
                         status_text.text("All PDFs generated successfully!")
                         
                         if generated_pdfs:
@@ -1615,25 +1669,22 @@ def handle_document_generation():
                                 documents = latex_gen.generate_bulk_pdfs(formatted_work_data, valid_bidders)
                             
                             if documents:
-                                zip_data = zip_gen.create_tender_documents_zip(
+                                zip_path = zip_gen.create_tender_documents_zip_file(
                                     st.session_state.current_work['work_name'],
                                     st.session_state.current_work['nit_number'],
-                                    documents
+                                    documents.items()
+                                )
+                                nit_number = st.session_state.current_work['nit_number'].replace('/', '_')
+                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                st.download_button(
+                                    label="📦 Download Complete Package (ZIP)",
+                                    data=read_and_remove(zip_path),
+                                    file_name=f"Tender_Documents_{nit_number}_{timestamp}.zip",
+                                    mime="application/zip",
+                                    type="primary"
                                 )
-                                if zip_data:
-                                    nit_number = st.session_state.current_work['nit_number'].replace('/', '_')
-                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                    st.download_button(
-                                        label="📦 Download Complete Package (ZIP)",
-                                        data=zip_data,
-                                        file_name=f"Tender_Documents_{nit_number}_{timestamp}.zip",
-                                        mime="application/zip",
-                                        type="primary"
-                                    )
-                                    st.success(f"✅ ZIP package created with {len(documents)} documents!")
-                                    show_balloons()
-                                else:
-                                    st.error("❌ Failed to create ZIP package.")
+                                st.success(f"✅ ZIP package created with {len(documents)} documents!")
+                                show_balloons()
                             else:
                                 st.error("❌ No documents available to package.")
                     except Exception as e:
@@ -1753,7 +1804,7 @@ def handle_document_generation_latex():
                                 )
                             except Exception as e:
                                 logging.error(f"LaTeX comparative generation failed: {e}; using fallback")
-                                pdf_bytes = PDFGenerator().generate_comparative_statement_pdf(
+                                pdf_bytes = get_pdf_generator().generate_comparative_statement_pdf(
                                     st.session_state.current_work,
                                     st.session_state.bidders
                                 )
@@ -1926,7 +1977,7 @@ def handle_document_generation_latex():
                 pdf_bytes = latex_gen.generate_letter_acceptance_pdf(work_data, l1_bidder)
             except Exception as e:
                 logging.error(f"LaTeX LOA generation failed: {e}; using fallback")
-                pdf_bytes = PDFGenerator().generate_letter_of_acceptance_pdf(work_data, valid_bidders)
+                pdf_bytes = get_pdf_generator().generate_letter_of_acceptance_pdf(work_data, valid_bidders)
             st.download_button(
                 label="📥 Download Letter of Acceptance",
                 data=pdf_bytes,
@@ -1940,7 +1991,7 @@ def handle_document_generation_latex():
                 pdf_bytes = latex_gen.generate_work_order_pdf(work_data, l1_bidder)
             except Exception as e:
                 logging.error(f"LaTeX Work Order generation failed: {e}; using fallback")
-                pdf_bytes = PDFGenerator().generate_work_order_pdf(work_data, valid_bidders)
+                pdf_bytes = get_pdf_generator().generate_work_order_pdf(work_data, valid_bidders)
             st.download_button(
                 label="📥 Download Work Order",
                 data=pdf_bytes,
@@ -1954,7 +2005,7 @@ def handle_document_generation_latex():
                 pdf_bytes = latex_gen.generate_scrutiny_sheet_pdf(work_data, valid_bidders)
             except Exception as e:
                 logging.error(f"LaTeX Scrutiny generation failed: {e}; using fallback")
-                pdf_bytes = PDFGenerator().generate_scrutiny_sheet_pdf(work_data, valid_bidders)
+                pdf_bytes = get_pdf_generator().generate_scrutiny_sheet_pdf(work_data, valid_bidders)
             st.download_button(
                 label="📥 Download Scrutiny Sheet",
                 data=pdf_bytes,
@@ -1976,7 +2027,7 @@ def handle_document_generation_latex():
                     documents = {}
                 if not documents:
                     try:
-                        pdf_gen_fallback = PDFGenerator()
+                        pdf_gen_fallback = get_pdf_generator()
                         documents = {
                             f'Comparative_Statement_Work_{work_id}.pdf': pdf_gen_fallback.generate_comparative_statement_pdf(work_data, valid_bidders),
                             f'Letter_of_Acceptance_Work_{work_id}.pdf': pdf_gen_fallback.generate_letter_of_acceptance_pdf(work_data, valid_bidders),
@@ -1988,10 +2039,10 @@ def handle_document_generation_latex():
                         documents = {}
                 if documents:
                     zip_gen = ZipGenerator()
-                    zip_buffer = zip_gen.create_zip(documents)
+                    zip_path = zip_gen.create_zip_file(documents.items())
                     st.download_button(
                         label="📦 Download Complete Package (ZIP)",
-                        data=zip_buffer,
+                        data=read_and_remove(zip_path),
                         file_name=f"{work_data['work_info']['nit_number']}_Work_{work_id}_documents.zip",
                         mime="application/zip"
                     )
@@ -0,0 +1,77 @@
+"""
+Asset Cache for Tender Processing System
+Memoises templates and other static assets read from disk, reloading a
+file only when its modification time or size changes
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AssetCache:
+    """Process-wide memo of parsed files (invalidated by mtime) and built-once assets."""
+
+    def __init__(self):
+        self._files: Dict[Tuple[str, Hashable], Tuple[Tuple[int, int], Any]] = {}
+        self._static: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self, path: str, parse: Optional[Callable[[str], Any]] = None,
+             parser_key: Hashable = None, encoding: str = 'utf-8') -> Any:
+        """
+        Return the parsed contents of a text file, re-reading it only after it changes.
+
+        Args:
+            path: File to read
+            parse: Callable applied to the file text (the text itself if None)
+            parser_key: Distinguishes different parses of the same file
+            encoding: Text encoding of the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = os.path.abspath(path)
+        key = (path, parser_key)
+        signature = self._signature(path)
+        with self._lock:
+            cached = self._files.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'r', encoding=encoding) as f:
+            text = f.read()
+        value = parse(text) if parse else text
+        with self._lock:
+            self._files[key] = (signature, value)
+        if cached is not None:
+            logging.info(f"Reloaded changed asset {path}")
+        return value
+
+    def static(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the asset stored under key, building it on first use."""
+        with self._lock:
+            if key in self._static:
+                return self._static[key]
+        value = build()
+        with self._lock:
+            return self._static.setdefault(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._static.clear()
+
+
+_default_cache = AssetCache()
+
+
+def get_asset_cache() -> AssetCache:
+    """Return the asset cache shared by every generator in the process."""
+    return _default_cache
@@ -0,0 +1,171 @@
+"""
+Bid Analytics for Tender Processing System
+Historical quoted percentages, win rates and margins per contractor,
+aggregated column-wise over the full bid history
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Estimated-cost bands (Rs) used to break down bidder behaviour
+COST_BAND_EDGES = [0, 5_00_000, 25_00_000, 1_00_00_000, 5_00_00_000, np.inf]
+COST_BAND_LABELS = ['Up to 5 L', '5 L - 25 L', '25 L - 1 Cr', '1 Cr - 5 Cr', 'Above 5 Cr']
+
+# Work type inferred from the work name when a record has no 'work_type'
+WORK_TYPE_KEYWORDS = {
+    'Road': ('road', 'cc ', 'bt ', 'pavement', 'culvert', 'bridge'),
+    'Building': ('building', 'construction of', 'room', 'hall', 'boundary wall', 'toilet'),
+    'Electrical': ('electric', 'wiring', 'lighting', 'transformer', 'pole'),
+    'Water Supply': ('water', 'pipeline', 'tank', 'tubewell', 'drain', 'sewer'),
+    'Repair & Maintenance': ('repair', 'maintenance', 'renovation', 'painting'),
+}
+
+SUMMARY_COLUMNS = [
+    'bidder', 'bids', 'decided_bids', 'wins', 'win_rate', 'mean_percentage', 'median_percentage',
+    'min_percentage', 'max_percentage', 'mean_margin_below_estimate', 'last_bid_date'
+]
+
+
+def classify_work_type(work_names: pd.Series) -> pd.Series:
+    """Map work names to WORK_TYPE_KEYWORDS categories ('Other' if none match)."""
+    lowered = work_names.fillna('').astype(str).str.lower()
+    work_type = pd.Series('Other', index=work_names.index, dtype=object)
+    # Earlier categories win, so apply in reverse
+    for label, keywords in reversed(list(WORK_TYPE_KEYWORDS.items())):
+        pattern = '|'.join(keywords)
+        work_type[lowered.str.contains(pattern, regex=True)] = label
+    return work_type
+
+
+class BidAnalytics:
+    """Precomputed per-bidder summaries over the whole bid history."""
+
+    def __init__(self, bids: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            bids: Bid records as stored by BidderManager (name, bid_amount,
+                percentage, work_item, work_name, estimated_cost, date_added;
+                optional tender_id, nit_number and work_type)
+
+        A bid belongs to the tender named by its tender_id, or else to its
+        (nit_number, work_item). Bids with neither have no known outcome:
+        they count towards 'bids' but not towards wins or win rates.
+        """
+        self.bids = self._build_frame(list(bids))
+        self.summary = self._summarise(self.bids, ['bidder_key'])
+        self.breakdown = self._summarise(self.bids, ['bidder_key', 'work_type', 'cost_band'])
+        # Row positions of each bidder's bids, for O(1) history lookups
+        self._positions = self.bids.groupby('bidder_key', sort=False, observed=True).indices
+        logging.info(f"Built bid analytics over {len(self.bids)} bids and {len(self.summary)} bidders")
+
+    @staticmethod
+    def bidder_key(name: str) -> str:
+        """Case-folded key under which a bidder's history is grouped."""
+        return ' '.join(str(name or '').casefold().split())
+
+    def _build_frame(self, bids: List[Dict[str, Any]]) -> pd.DataFrame:
+        frame = pd.DataFrame.from_records(bids)
+        for column in ('name', 'work_item', 'work_name', 'tender_id', 'nit_number', 'work_type', 'date_added'):
+            if column not in frame:
+                frame[column] = None
+        for column in ('bid_amount', 'percentage', 'estimated_cost'):
+            frame[column] = pd.to_numeric(frame.get(column), errors='coerce') if len(frame) else pd.Series(dtype=float)
+
+        frame['bidder'] = frame['name'].fillna('').astype(str).str.strip()
+        frame['bidder_key'] = frame['bidder'].str.casefold().str.split().str.join(' ')
+        frame = frame[frame['bidder_key'] != ''].reset_index(drop=True)
+
+        # date_added is dd-mm-yy; fall back to ISO, then any day-first format
+        dates = pd.to_datetime(frame['date_added'], format='%d-%m-%y', errors='coerce')
+        for options in ({'format': 'ISO8601'}, {'format': 'mixed', 'dayfirst': True}):
+            unparsed = dates.isna() & frame['date_added'].notna()
+            if not unparsed.any():
+                break
+            dates[unparsed] = pd.to_datetime(frame.loc[unparsed, 'date_added'], errors='coerce', **options)
+        frame['date'] = dates
+
+        frame['work_type'] = frame['work_type'].fillna(classify_work_type(frame['work_name'])).astype('category')
+        frame['cost_band'] = pd.cut(frame['estimated_cost'], COST_BAND_EDGES,
+                                    labels=COST_BAND_LABELS, right=False)
+        frame['margin_below_estimate'] = -frame['percentage']
+
+        # A tender is identified by its id or by its NIT and item number, never
+        # by matching work content; its lowest bid wins
+        tender_id = frame['tender_id'].fillna('').astype(str).str.strip()
+        nit_number = frame['nit_number'].fillna('').astype(str).str.strip()
+        work_item = frame['work_item'].fillna('').astype(str).str.strip()
+        tender = ('id:' + tender_id).where(tender_id != '', 'nit:' + nit_number + '|' + work_item)
+        frame['tender'] = tender.where((tender_id != '') | (nit_number != ''))
+        lowest = frame.groupby('tender')['bid_amount'].transform('min')
+        won = frame['bid_amount'].notna() & (frame['bid_amount'] == lowest)
+        frame['won'] = won.astype('boolean').where(frame['tender'].notna())
+        return frame
+
+    @staticmethod
+    def _summarise(frame: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        grouped = frame.groupby(keys, sort=False, observed=True)
+        summary = grouped.agg(
+            bidder=('bidder', 'first'),
+            bids=('bidder', 'size'),
+            decided_bids=('won', 'count'),
+            wins=('won', 'sum'),
+            mean_percentage=('percentage', 'mean'),
+            median_percentage=('percentage', 'median'),
+            min_percentage=('percentage', 'min'),
+            max_percentage=('percentage', 'max'),
+            mean_margin_below_estimate=('margin_below_estimate', 'mean'),
+            last_bid_date=('date', 'max'),
+        )
+        summary['wins'] = summary['wins'].astype(int)
+        summary['win_rate'] = summary['wins'] / summary['decided_bids'].where(summary['decided_bids'] > 0)
+        return summary[SUMMARY_COLUMNS].reset_index(level=keys[1:]).sort_index()
+
+    def bidder_profile(self, name: str) -> Optional[Dict[str, Any]]:
+        """Overall summary for one bidder, or None if they have no history."""
+        key = self.bidder_key(name)
+        if key not in self.summary.index:
+            return None
+        return self.summary.loc[key].to_dict()
+
+    def bidder_breakdown(self, name: str) -> pd.DataFrame:
+        """One bidder's summary split by work type and cost band."""
+        key = self.bidder_key(name)
+        if key not in self.breakdown.index:
+            return self.breakdown.iloc[0:0]
+        return self.breakdown.loc[[key]].reset_index(drop=True)
+
+    def quoted_percentages(self, name: str) -> pd.DataFrame:
+        """One bidder's bids in date order with the percentage quoted and whether it won."""
+        positions = self._positions.get(self.bidder_key(name))
+        columns = ['date', 'work_item', 'work_name', 'work_type', 'cost_band',
+                   'estimated_cost', 'percentage', 'bid_amount', 'won']
+        if positions is None:
+            return self.bids.iloc[0:0][columns]
+        return self.bids.iloc[positions][columns].sort_values('date').reset_index(drop=True)
+
+    def top_bidders(self, by: str = 'wins', n: int = 10, work_type: Optional[str] = None,
+                    cost_band: Optional[str] = None, min_bids: int = 1) -> pd.DataFrame:
+        """
+        Rank bidders, optionally within one work type and/or cost band.
+
+        Args:
+            by: Summary column to sort on (descending), e.g. 'wins' or 'win_rate'
+            n: Number of bidders returned
+            work_type: Restrict to one work type
+            cost_band: Restrict to one of COST_BAND_LABELS
+            min_bids: Ignore bidders with fewer bids in the selection
+        """
+        if work_type is None and cost_band is None:
+            table = self.summary
+        else:
+            mask = np.ones(len(self.bids), dtype=bool)
+            if work_type is not None:
+                mask &= (self.bids['work_type'] == work_type).to_numpy()
+            if cost_band is not None:
+                mask &= (self.bids['cost_band'] == cost_band).to_numpy()
+            table = self._summarise(self.bids[mask], ['bidder_key'])
+        table = table[table['bids'] >= min_bids]
+        return table.nlargest(n, by).reset_index(drop=True)
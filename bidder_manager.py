@@ -1,10 +1,15 @@
 import json
-import os
 import logging
+import os
+import warnings
+from bisect import bisect_left, insort
+from collections import Counter
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from pathlib import Path
 from date_utils import DateUtils
+from fuzzy_index import TrigramIndex
+from bid_analytics import BidAnalytics
+from bidder_repository import LEGACY_JSON_PATH, BidderRepository, get_bidder_repository
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -12,57 +17,182 @@ logger = logging.getLogger(__name__)
 class BidderManager:
     """Enhanced bidder management with persistent storage and improved date handling."""
     
-    def __init__(self, database_file: str = "bidder_database.json"):
-        """Initialize BidderManager with database file path."""
-        self.database_file = str(Path(database_file).resolve())
-        self.date_utils = DateUtils()
-        self.bidders_db = self._load_database()
-    
-    def _load_database(self) -> Dict[str, Any]:
-        """Load bidder database from JSON file."""
-        try:
-            if os.path.exists(self.database_file):
-                with open(self.database_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded {len(data.get('bidders', []))} bidders from database")
-                    return data
-        except Exception as e:
-            logger.error(f"Error loading database: {e}")
+    def __init__(self, repository: Optional[BidderRepository] = None,
+                 database_file: Optional[str] = None):
+        """
+        Initialize BidderManager on top of the shared bidder repository.
         
-        # Return default structure if file doesn't exist or error occurred
-        return {
+        Records and indexes are held in memory and reloaded only when the
+        repository reports a write made elsewhere.
+        
+        Args:
+            repository: Bidder store (the process-wide one if None)
+            database_file: Deprecated JSON database path from before the
+                SQLite store; it is imported into a store next to it (the
+                default bidder_database.json goes into the shared store).
+                Also accepted as the first positional argument.
+        """
+        if isinstance(repository, (str, os.PathLike)):
+            database_file, repository = repository, None
+        if database_file is not None:
+            if repository is not None:
+                raise TypeError("Pass either repository or database_file, not both")
+            warnings.warn(
+                "BidderManager(database_file) is deprecated; pass a BidderRepository instead",
+                DeprecationWarning, stacklevel=2
+            )
+            repository = self._repository_for_json(os.fspath(database_file))
+        elif repository is not None and not isinstance(repository, BidderRepository):
+            raise TypeError(
+                f"repository must be a BidderRepository, not {type(repository).__name__}"
+            )
+        self.repository = repository or get_bidder_repository()
+        self.date_utils = DateUtils()
+        self.bidders_db = {
             'bidders': [],
             'statistics': {
                 'total_bidders': 0,
                 'last_updated': self.date_utils.get_current_date()
             }
         }
+        self._generation = None
+        self._analytics: Optional[Tuple[Any, BidAnalytics]] = None
+        self._sync()
+    
+    @staticmethod
+    def _repository_for_json(database_file: str) -> BidderRepository:
+        """Repository that stands in for an old JSON database file."""
+        if os.path.abspath(database_file) == os.path.abspath(LEGACY_JSON_PATH):
+            return get_bidder_repository()
+        return get_bidder_repository(os.path.splitext(database_file)[0] + '.db', database_file)
+    
+    def _sync(self) -> None:
+        """Reload records and rebuild indexes if the repository changed since the last read."""
+        generation = self.repository.generation
+        if generation == self._generation:
+            return
+        # Private copies: update_bidder edits records in place
+        self.bidders_db['bidders'] = [dict(bidder) for bidder in self.repository.get_bids()]
+        self.bidders_db['statistics']['total_bidders'] = len(self.bidders_db['bidders'])
+        self._rebuild_indexes()
+        self._generation = generation
+        logger.info(f"Loaded {len(self.bidders_db['bidders'])} bidders from repository")
     
-    def _save_database(self) -> bool:
-        """Save bidder database to JSON file."""
+    def _persist(self, write) -> bool:
+        """Run a repository write, keeping the in-memory copy unless someone else also wrote."""
+        generation = self.repository.generation
         try:
-            # Create directory if it doesn't exist
-            db_dir = os.path.dirname(self.database_file)
-            if db_dir:
-                os.makedirs(db_dir, exist_ok=True)
-            
-            # Update statistics
-            self.bidders_db['statistics']['total_bidders'] = len(self.bidders_db['bidders'])
-            self.bidders_db['statistics']['last_updated'] = self.date_utils.get_current_date()
-            
-            with open(self.database_file, 'w', encoding='utf-8') as f:
-                json.dump(self.bidders_db, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved database with {len(self.bidders_db['bidders'])} bidders")
-            return True
-            
+            write()
         except Exception as e:
             logger.error(f"Error saving database: {e}")
+            self._generation = None
             return False
-            
+        
+        if self._generation == generation and self.repository.generation == generation + 1:
+            self._generation = generation + 1
+        statistics = self.bidders_db.setdefault('statistics', {})
+        statistics['total_bidders'] = len(self.bidders_db['bidders'])
+        statistics['last_updated'] = self.date_utils.get_current_date()
+        return True
+    
+    @staticmethod
+    def _name_key(name: str) -> str:
+        """Case-folded lookup key for a bidder name."""
+        return (name or '').strip().casefold()
+    
+    def _rebuild_indexes(self) -> None:
+        """Build the id, name and sorted-prefix indexes from bidders_db."""
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._name_keys: List[str] = []
+        self._fuzzy = TrigramIndex()
+        self._reset_statistics()
+        for bidder in self.bidders_db['bidders']:
+            self._index_add(bidder)
+    
+    def _reset_statistics(self) -> None:
+        """Zero the running aggregates behind get_statistics."""
+        self._sums = {'percentage': 0.0, 'bid_amount': 0.0}
+        self._counts = {'percentage': 0, 'bid_amount': 0}
+        self._name_counts: Counter = Counter()
+        self._top_name: Optional[str] = None
+        self._date_counts: Counter = Counter()
+        self._min_date: Optional[datetime] = None
+        self._max_date: Optional[datetime] = None
+        if not hasattr(self, '_parsed_dates'):
+            self._parsed_dates: Dict[str, Optional[datetime]] = {}
+    
+    def _parse_date_added(self, value: Any) -> Optional[datetime]:
+        """Parse a date_added string once; repeats come from a memo."""
+        value = str(value or '')
+        if value not in self._parsed_dates:
+            self._parsed_dates[value] = self.date_utils.parse_date(value)
+        return self._parsed_dates[value]
+    
+    def _statistics_apply(self, bidder: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) one record from the running aggregates."""
+        for field in ('percentage', 'bid_amount'):
+            if field in bidder:
+                try:
+                    self._sums[field] += sign * float(bidder.get(field) or 0)
+                    self._counts[field] += sign
+                except (TypeError, ValueError):
+                    pass
+        
+        name = bidder.get('name', '')
+        self._name_counts[name] += sign
+        if self._name_counts[name] <= 0:
+            del self._name_counts[name]
+        if sign > 0:
+            if self._top_name is None or self._name_counts[name] > self._name_counts[self._top_name]:
+                self._top_name = name
+        elif name == self._top_name:
+            # Only a decrement of the leader can change it; rescan distinct names
+            self._top_name = max(self._name_counts, key=self._name_counts.get) if self._name_counts else None
+        
+        date = self._parse_date_added(bidder.get('date_added', ''))
+        if date is None:
+            return
+        self._date_counts[date] += sign
+        if self._date_counts[date] <= 0:
+            del self._date_counts[date]
+        if sign > 0:
+            self._min_date = date if self._min_date is None else min(self._min_date, date)
+            self._max_date = date if self._max_date is None else max(self._max_date, date)
+        elif date in (self._min_date, self._max_date) and date not in self._date_counts:
+            self._min_date = min(self._date_counts) if self._date_counts else None
+            self._max_date = max(self._date_counts) if self._date_counts else None
+    
+    def _index_add(self, bidder: Dict[str, Any]) -> None:
+        self._statistics_apply(bidder, 1)
+        if bidder.get('id') is not None:
+            self._by_id[bidder['id']] = bidder
+        key = self._name_key(bidder.get('name', ''))
+        records = self._by_name.get(key)
+        if records is None:
+            self._by_name[key] = [bidder]
+            insort(self._name_keys, key)
+            self._fuzzy.add(key, bidder.get('name', ''))
+        else:
+            records.append(bidder)
+    
+    def _index_remove(self, bidder: Dict[str, Any]) -> None:
+        self._statistics_apply(bidder, -1)
+        self._by_id.pop(bidder.get('id'), None)
+        key = self._name_key(bidder.get('name', ''))
+        records = self._by_name.get(key, [])
+        records[:] = [b for b in records if b is not bidder]
+        if not records:
+            self._by_name.pop(key, None)
+            self._fuzzy.remove(key)
+            i = bisect_left(self._name_keys, key)
+            if i < len(self._name_keys) and self._name_keys[i] == key:
+                del self._name_keys[i]
+    
     def add_bidder(self, name: str, bid_amount: float, percentage: float, address: str, 
                   earnest_money: float, work_item: str, work_name: str, 
-                  estimated_cost: float) -> Tuple[bool, str]:
+                  estimated_cost: float, nit_number: Optional[str] = None,
+                  tender_id: Optional[str] = None) -> Tuple[bool, str]:
         """
         Add a new bidder to the system.
         
@@ -75,6 +205,9 @@ class BidderManager:
             work_item: Work item number
             work_name: Name of the work
             estimated_cost: Estimated cost of the work
+            nit_number: NIT the work belongs to; bids without it (or a
+                tender_id) are left out of win/loss analytics
+            tender_id: Explicit tender identifier, if the caller has one
             
         Returns:
             Tuple of (success: bool, message: str)
@@ -107,12 +240,17 @@ class BidderManager:
                 'date_added': self.date_utils.get_current_date(),
                 'last_updated': self.date_utils.get_current_date()
             }
+            if nit_number:
+                bidder['nit_number'] = str(nit_number).strip()
+            if tender_id:
+                bidder['tender_id'] = str(tender_id).strip()
             
             # Add to database
+            self._sync()
             self.bidders_db['bidders'].append(bidder)
+            self._index_add(bidder)
             
-            # Save to file
-            if self._save_database():
+            if self._persist(lambda: self.repository.put_bid(bidder)):
                 logger.info(f"Added bidder: {name}")
                 return True, f"Successfully added bidder: {name}"
             else:
@@ -137,19 +275,22 @@ class BidderManager:
             True if successful, False otherwise
         """
         try:
-            for bidder in self.bidders_db['bidders']:
-                if bidder.get('id') == bidder_id:
-                    # Update fields
-                    for key, value in updated_data.items():
-                        if key != 'id':  # Don't allow ID changes
-                            bidder[key] = value
-                    
-                    # Update timestamp
-                    bidder['last_updated'] = self.date_utils.get_current_date()
-                    
-                    self._save_database()
-                    logging.info(f"Updated bidder: {bidder['name']}")
-                    return True
+            self._sync()
+            bidder = self._by_id.get(bidder_id)
+            if bidder is not None:
+                self._index_remove(bidder)
+                # Update fields
+                for key, value in updated_data.items():
+                    if key != 'id':  # Don't allow ID changes
+                        bidder[key] = value
+                
+                # Update timestamp
+                bidder['last_updated'] = self.date_utils.get_current_date()
+                self._index_add(bidder)
+                
+                self._persist(lambda: self.repository.put_bid(bidder))
+                logging.info(f"Updated bidder: {bidder['name']}")
+                return True
             
             logging.warning(f"Bidder with ID {bidder_id} not found")
             return False
@@ -169,14 +310,16 @@ class BidderManager:
             True if successful, False otherwise
         """
         try:
-            original_count = len(self.bidders_db['bidders'])
-            self.bidders_db['bidders'] = [
-                b for b in self.bidders_db['bidders'] 
-                if b.get('id') != bidder_id
-            ]
+            self._sync()
+            bidder = self._by_id.get(bidder_id)
             
-            if len(self.bidders_db['bidders']) < original_count:
-                self._save_database()
+            if bidder is not None:
+                self._index_remove(bidder)
+                self.bidders_db['bidders'] = [
+                    b for b in self.bidders_db['bidders'] 
+                    if b.get('id') != bidder_id
+                ]
+                self._persist(lambda: self.repository.delete_bid(bidder_id))
                 logging.info(f"Removed bidder with ID: {bidder_id}")
                 return True
             else:
@@ -197,10 +340,9 @@ class BidderManager:
         Returns:
             Bidder dictionary or None if not found
         """
-        for bidder in self.bidders_db['bidders']:
-            if bidder.get('id') == bidder_id:
-                return bidder.copy()
-        return None
+        self._sync()
+        bidder = self._by_id.get(bidder_id)
+        return bidder.copy() if bidder is not None else None
     
     def get_all_bidders(self) -> List[Dict[str, Any]]:
         """
@@ -209,6 +351,7 @@ class BidderManager:
         Returns:
             List of all bidder dictionaries
         """
+        self._sync()
         return [bidder.copy() for bidder in self.bidders_db['bidders']]
     
     def search_bidders(self, search_term: str) -> List[Dict[str, Any]]:
@@ -221,35 +364,79 @@ class BidderManager:
         Returns:
             List of matching bidder dictionaries
         """
-        search_term = search_term.lower()
+        self._sync()
+        search_term = self._name_key(search_term)
         results = []
         
-        for bidder in self.bidders_db['bidders']:
-            if search_term in bidder.get('name', '').lower():
-                results.append(bidder.copy())
+        # Scan distinct names rather than every historical record
+        for key, records in self._by_name.items():
+            if search_term in key:
+                results.extend(bidder.copy() for bidder in records)
         
         return results
     
+    def fuzzy_search_bidders(self, search_term: str, limit: int = 10,
+                             min_score: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        Typo-tolerant search by bidder name.
+        
+        Args:
+            search_term: Name as typed, e.g. "M/s Sharma Electrical"
+            limit: Maximum number of distinct bidders returned
+            min_score: Minimum similarity (0-1) for a match
+            
+        Returns:
+            Latest record of each matching bidder, best match first, with
+            its similarity under 'match_score'
+        """
+        self._sync()
+        results = []
+        for key, score in self._fuzzy.search(search_term, limit, min_score):
+            bidder = self._by_name[key][-1].copy()
+            bidder['match_score'] = score
+            results.append(bidder)
+        return results
+    
+    def get_bidders_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Get every record for a bidder name (case-insensitive exact match).
+        
+        Args:
+            name: Bidder's name/company
+            
+        Returns:
+            List of matching bidder dictionaries
+        """
+        self._sync()
+        return [bidder.copy() for bidder in self._by_name.get(self._name_key(name), [])]
+    
     def get_bidder_suggestions(self, partial_name: str, limit: int = 5) -> List[str]:
         """
         Get bidder name suggestions for auto-completion.
         
+        Only names starting with the typed text are suggested, read straight
+        from the sorted name index (O(log n + limit)). Use search_bidders for
+        names containing the text elsewhere, or fuzzy_search_bidders for
+        typo-tolerant matches.
+        
         Args:
             partial_name: Partial bidder name
             limit: Maximum number of suggestions
             
         Returns:
-            List of suggested bidder names
+            List of suggested bidder names in alphabetical order
         """
-        partial_name = partial_name.lower()
+        self._sync()
+        prefix = self._name_key(partial_name)
         suggestions = []
         
-        for bidder in self.bidders_db['bidders']:
-            name = bidder.get('name', '')
-            if partial_name in name.lower() and name not in suggestions:
-                suggestions.append(name)
-                if len(suggestions) >= limit:
-                    break
+        i = bisect_left(self._name_keys, prefix)
+        while i < len(self._name_keys) and len(suggestions) < limit:
+            key = self._name_keys[i]
+            if not key.startswith(prefix):
+                break
+            suggestions.append(self._by_name[key][0].get('name', ''))
+            i += 1
         
         return suggestions
     
@@ -260,9 +447,10 @@ class BidderManager:
         Returns:
             Statistics dictionary
         """
-        bidders = self.bidders_db['bidders']
+        self._sync()
+        total = len(self.bidders_db['bidders'])
         
-        if not bidders:
+        if not total:
             return {
                 'total_bidders': 0,
                 'average_percentage': 0,
@@ -271,42 +459,37 @@ class BidderManager:
                 'last_updated': self.bidders_db['statistics'].get('last_updated', '')
             }
         
-        # Calculate statistics
-        percentages = [b.get('percentage', 0) for b in bidders if 'percentage' in b]
-        bid_amounts = [b.get('bid_amount', 0) for b in bidders if 'bid_amount' in b]
-        
-        # Find most common bidder
-        bidder_counts = {}
-        for bidder in bidders:
-            name = bidder.get('name', '')
-            bidder_counts[name] = bidder_counts.get(name, 0) + 1
-        
-        most_common_bidder = max(bidder_counts.items(), key=lambda x: x[1])[0] if bidder_counts else None
-        
-        # Date range
-        dates = []
-        for bidder in bidders:
-            date_added = bidder.get('date_added', '')
-            parsed_date = self.date_utils.parse_date(date_added)
-            if parsed_date:
-                dates.append(parsed_date)
-        
         date_range = None
-        if dates:
-            min_date = min(dates)
-            max_date = max(dates)
-            date_range = f"{self.date_utils.format_date(min_date)} to {self.date_utils.format_date(max_date)}"
+        if self._min_date is not None:
+            date_range = (f"{self.date_utils.format_display_date(self._min_date)} to "
+                          f"{self.date_utils.format_display_date(self._max_date)}")
         
+        counts = self._counts
         return {
-            'total_bidders': len(bidders),
-            'unique_bidders': len(bidder_counts),
-            'average_percentage': sum(percentages) / len(percentages) if percentages else 0,
-            'average_bid_amount': sum(bid_amounts) / len(bid_amounts) if bid_amounts else 0,
-            'most_common_bidder': most_common_bidder,
+            'total_bidders': total,
+            'unique_bidders': len(self._name_counts),
+            'average_percentage': self._sums['percentage'] / counts['percentage'] if counts['percentage'] else 0,
+            'average_bid_amount': self._sums['bid_amount'] / counts['bid_amount'] if counts['bid_amount'] else 0,
+            'most_common_bidder': self._top_name,
             'date_range': date_range,
             'last_updated': self.bidders_db['statistics'].get('last_updated', '')
         }
     
+    def get_analytics(self) -> BidAnalytics:
+        """
+        Get historical bid analytics (win rates, quoted percentages, margins).
+        
+        Built once per repository change and reused for every query until
+        the next write.
+        
+        Returns:
+            BidAnalytics over the full bid history
+        """
+        self._sync()
+        if self._analytics is None or self._analytics[0] != self._generation or self._generation is None:
+            self._analytics = (self._generation, BidAnalytics(self.bidders_db['bidders']))
+        return self._analytics[1]
+    
     def _generate_bidder_id(self) -> str:
         """Generate unique bidder ID."""
         import uuid
@@ -323,6 +506,7 @@ class BidderManager:
             True if successful, False otherwise
         """
         try:
+            self._sync()
             if file_path.endswith('.json'):
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(self.bidders_db, f, indent=2, ensure_ascii=False)
@@ -368,7 +552,9 @@ class BidderManager:
             else:
                 raise ValueError("Unsupported file format. Use .json or .csv")
             
-            self._save_database()
+            self._rebuild_indexes()
+            if not self._persist(lambda: self.repository.replace_bids(self.bidders_db['bidders'])):
+                return False
             logging.info(f"Imported data from {file_path}")
             return True
             
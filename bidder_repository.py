@@ -0,0 +1,282 @@
+"""
+Bidder Repository for Tender Processing System
+Single SQLite-backed store for the bidder directory and bid history,
+shared by BidderManager, DatabaseManager and the Streamlit app
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from database_manager import DatabaseManager
+from date_utils import DateUtils
+
+DEFAULT_DB_PATH = "tender_bidders.db"
+LEGACY_JSON_PATH = "bidder_database.json"
+
+BID_UPSERT_SQL = '''
+    INSERT INTO bids (id, name, data)
+    VALUES (?, ?, ?)
+    ON CONFLICT (id) DO UPDATE
+    SET name = excluded.name, data = excluded.data
+'''
+
+
+class BidderRepository:
+    """Bidder directory and bid history in one SQLite file, with an in-process read cache."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 legacy_json_path: Optional[str] = LEGACY_JSON_PATH):
+        """
+        Args:
+            db_path: SQLite database file
+            legacy_json_path: Old bidder_database.json imported once on first open
+        """
+        self.db = DatabaseManager(db_path)
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._directory: Optional[Dict[str, Dict[str, Any]]] = None
+        self._bids: Optional[List[Dict[str, Any]]] = None
+        self._options: Optional[Tuple[str, ...]] = None
+        self._signature = self._file_signature()
+        self.db.add_write_listener(self._invalidate)
+        if legacy_json_path:
+            self._import_legacy_json(legacy_json_path)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every write; lets callers keep derived data in sync."""
+        self._refresh_if_changed_on_disk()
+        return self._generation
+
+    def _file_signature(self) -> tuple:
+        """(mtime, size) of the database file and its WAL; changes whenever anyone commits."""
+        signature = []
+        for path in (self.db.db_path, self.db.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._directory = None
+            self._bids = None
+            self._options = None
+            self._signature = self._file_signature()
+
+    def _refresh_if_changed_on_disk(self) -> None:
+        """Drop cached reads if another process wrote to the database file."""
+        if self._file_signature() != self._signature:
+            self._invalidate()
+
+    @staticmethod
+    def _legacy_timestamp(*values: Any) -> Optional[str]:
+        """Latest of the given legacy dates (e.g. DD-MM-YY) as an SQLite timestamp, or None."""
+        parsed = [DateUtils().parse_date(str(value)) for value in values if value]
+        parsed = [value for value in parsed if value is not None]
+        return max(parsed).strftime('%Y-%m-%d %H:%M:%S') if parsed else None
+
+    @classmethod
+    def _directory_row(cls, bidder: Dict[str, Any], legacy: bool = False) -> tuple:
+        """
+        (name, contact, address, last_used, created_at) for DatabaseManager.upsert_bidders.
+
+        Timestamps are None (now) unless legacy is set, in which case they
+        are carried over from the old JSON record's usage dates.
+        """
+        last_used = created_at = None
+        if legacy:
+            last_used = cls._legacy_timestamp(
+                bidder.get('last_used'), bidder.get('last_updated'), bidder.get('date_added')
+            )
+            created_at = cls._legacy_timestamp(bidder.get('created_at') or bidder.get('date_added')) or last_used
+        return (
+            str(bidder.get('name') or '').strip(),
+            str(bidder.get('contact') or '').strip(),
+            str(bidder.get('address') or '').strip(),
+            last_used,
+            created_at,
+        )
+
+    @staticmethod
+    def _bid_row(bid: Dict[str, Any]) -> tuple:
+        return (bid.get('id'), str(bid.get('name') or '').strip(),
+                json.dumps(bid, ensure_ascii=False, default=str))
+
+    # Bidder directory
+
+    def get_directory(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the bidder directory keyed by name.
+
+        The mapping is the shared cache itself: treat it as read-only.
+        """
+        with self._lock:
+            self._refresh_if_changed_on_disk()
+            if self._directory is None:
+                cursor = self.db.get_connection().execute('''
+                    SELECT id, name, contact, address, last_used, created_at
+                    FROM bidders
+                    ORDER BY name COLLATE NOCASE
+                ''')
+                self._directory = {
+                    row[1]: {
+                        'id': row[0],
+                        'name': row[1],
+                        'contact': row[2] or '',
+                        'address': row[3] or '',
+                        'last_used': row[4],
+                        'created_at': row[5]
+                    }
+                    for row in cursor
+                }
+            return self._directory
+
+    def get_bidder_options(self) -> Tuple[str, ...]:
+        """Selectbox options: a blank choice followed by every directory name, built once per change."""
+        with self._lock:
+            directory = self.get_directory()
+            if self._options is None:
+                self._options = ("",) + tuple(directory)
+            return self._options
+
+    def get_directory_entry(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of one directory entry by exact name, or None."""
+        entry = self.get_directory().get(name)
+        return dict(entry) if entry is not None else None
+
+    def save_directory_entry(self, name: str, address: str = "", contact: str = "") -> bool:
+        """Add a bidder to the directory, or refresh its details and last_used."""
+        row = self._directory_row({'name': name, 'address': address, 'contact': contact})
+        if not row[0]:
+            return False
+        with self.db.get_connection() as conn:
+            self.db.upsert_bidders(conn, [row])
+        self.db.notify_write()
+        return True
+
+    def touch_bidders(self, names: Iterable[str]) -> None:
+        """Mark bidders as used now."""
+        rows = [(name,) for name in names if name]
+        if not rows:
+            return
+        with self.db.get_connection() as conn:
+            conn.executemany('''
+                UPDATE bidders SET last_used = CURRENT_TIMESTAMP
+                WHERE lower(trim(name)) = lower(trim(?))
+            ''', rows)
+        self.db.notify_write()
+
+    # Bid history
+
+    def get_bids(self) -> List[Dict[str, Any]]:
+        """
+        Return every bid record in insertion order.
+
+        The list is the shared cache itself: treat it as read-only.
+        """
+        with self._lock:
+            self._refresh_if_changed_on_disk()
+            if self._bids is None:
+                cursor = self.db.get_connection().execute('SELECT data FROM bids ORDER BY seq')
+                self._bids = [json.loads(row[0]) for row in cursor]
+            return self._bids
+
+    def put_bid(self, bid: Dict[str, Any]) -> None:
+        """Insert or replace a bid record (matched on 'id') and register its bidder."""
+        with self.db.get_connection() as conn:
+            conn.execute(BID_UPSERT_SQL, self._bid_row(bid))
+            if self._directory_row(bid)[0]:
+                self.db.upsert_bidders(conn, [self._directory_row(bid)])
+        self.db.notify_write()
+
+    def delete_bid(self, bid_id: str) -> bool:
+        """Delete a bid record by id."""
+        with self.db.get_connection() as conn:
+            deleted = conn.execute('DELETE FROM bids WHERE id = ?', (bid_id,)).rowcount
+        if deleted:
+            self.db.notify_write()
+        return deleted > 0
+
+    def replace_bids(self, bids: List[Dict[str, Any]]) -> None:
+        """Replace the whole bid history in one transaction."""
+        with self.db.get_connection() as conn:
+            self._write_bids(conn, bids, replace=True)
+        self.db.notify_write()
+
+    def _write_bids(self, conn, bids: List[Dict[str, Any]], replace: bool = False,
+                    legacy: bool = False) -> None:
+        if replace:
+            conn.execute('DELETE FROM bids')
+        conn.executemany(BID_UPSERT_SQL, [self._bid_row(bid) for bid in bids])
+        self.db.upsert_bidders(conn, [
+            row for row in (self._directory_row(bid, legacy) for bid in bids) if row[0]
+        ])
+
+    # Migration from the JSON files
+
+    def _import_legacy_json(self, path: str) -> None:
+        """
+        Copy bidder_database.json into the store the first time the store is opened.
+
+        Usage dates (last_used, last_updated, date_added) are carried over so
+        the recent-bidders ordering matches the old JSON store.
+        """
+        conn = self.db.get_connection()
+        try:
+            try:
+                if conn.execute("SELECT 1 FROM store_meta WHERE key = 'legacy_json_imported'").fetchone():
+                    return
+            except sqlite3.OperationalError as e:
+                # store_meta is missing when its migration has not run; treat as not imported
+                logging.warning(f"Bidder store metadata unavailable: {e}")
+            data = None
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+            with conn:
+                if isinstance(data, dict) and isinstance(data.get('bidders'), list):
+                    # BidderManager format: {'bidders': [bid records], 'statistics': {...}}
+                    self._write_bids(conn, [b for b in data['bidders'] if isinstance(b, dict)], legacy=True)
+                elif isinstance(data, dict):
+                    # Directory format: {name: {'address': ..., 'last_used': ...}}
+                    self.db.upsert_bidders(conn, [
+                        self._directory_row({**entry, 'name': name}, legacy=True)
+                        for name, entry in data.items()
+                        if isinstance(entry, dict) and str(name).strip()
+                    ])
+                conn.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_json_imported', ?)",
+                    (path,)
+                )
+            if data is not None:
+                logging.info(f"Imported legacy bidder data from {path}")
+        except Exception as e:
+            logging.error(f"Error importing legacy bidder data from {path}: {e}")
+        self.db.notify_write()
+
+
+_repositories: Dict[str, BidderRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_bidder_repository(db_path: str = DEFAULT_DB_PATH,
+                          legacy_json_path: Optional[str] = LEGACY_JSON_PATH) -> BidderRepository:
+    """
+    Return the process-wide repository for db_path, creating it on first use.
+
+    legacy_json_path is only used when the repository is created.
+    """
+    key = os.path.abspath(db_path)
+    with _repositories_lock:
+        if key not in _repositories:
+            _repositories[key] = BidderRepository(db_path, legacy_json_path)
+        return _repositories[key]
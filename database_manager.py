@@ -5,19 +5,212 @@ Handles SQLite operations for bidder credentials
 
 import sqlite3
 import json
+import csv
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, TextIO
 import os
+import re
+import threading
+import weakref
+from fuzzy_index import TrigramIndex
+
+def _fts5_available(conn) -> bool:
+    """True if this SQLite build can create FTS5 tables"""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE temp.fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# Optional SQLite features a migration may require; a migration whose
+# feature is missing is skipped so that later migrations still run
+MIGRATION_FEATURES = {
+    'fts5': _fts5_available,
+}
+
+# Schema migrations applied in order on open as (required feature or None,
+# script); PRAGMA user_version records how many have been applied (or
+# skipped) for a database file.
+SCHEMA_MIGRATIONS = [
+    # 1: FTS5 index over bidder names, kept in sync by triggers and
+    #    back-filled from rows already in the table
+    ('fts5', '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS bidders_fts
+        USING fts5(name, content='bidders', content_rowid='id');
+    CREATE TRIGGER IF NOT EXISTS bidders_fts_insert AFTER INSERT ON bidders BEGIN
+        INSERT INTO bidders_fts(rowid, name) VALUES (new.id, new.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS bidders_fts_delete AFTER DELETE ON bidders BEGIN
+        INSERT INTO bidders_fts(bidders_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS bidders_fts_update AFTER UPDATE OF name ON bidders BEGIN
+        INSERT INTO bidders_fts(bidders_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO bidders_fts(rowid, name) VALUES (new.id, new.name);
+    END;
+    INSERT INTO bidders_fts(bidders_fts) VALUES ('rebuild');
+    '''),
+    # 2: one row per case/space-normalised name (merging existing duplicates
+    #    into the most recently used row) and an index for recency ordering
+    (None, '''
+    UPDATE bidders SET contact = (
+        SELECT d.contact FROM bidders d
+        WHERE lower(trim(d.name)) = lower(trim(bidders.name)) AND d.contact != ''
+        ORDER BY d.last_used DESC, d.id DESC LIMIT 1
+    ) WHERE contact IS NULL OR contact = '';
+    DELETE FROM bidders WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY lower(trim(name)) ORDER BY last_used DESC, id DESC
+            ) AS position
+            FROM bidders
+        ) WHERE position > 1
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_bidders_name_key ON bidders (lower(trim(name)));
+    CREATE INDEX IF NOT EXISTS idx_bidders_last_used ON bidders (last_used);
+    '''),
+    # 3: shared bidder store - addresses in the directory, the bid history
+    #    previously kept in bidder_database.json, and one-off store flags
+    (None, '''
+    ALTER TABLE bidders ADD COLUMN address TEXT DEFAULT '';
+    CREATE TABLE IF NOT EXISTS bids (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT UNIQUE,
+        name TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_bids_name_key ON bids (lower(trim(name)));
+    CREATE TABLE IF NOT EXISTS store_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    '''),
+]
+
+# Column order for bidder exports
+BIDDER_FIELDS = ['id', 'name', 'contact', 'last_used', 'created_at']
+
+# Per-connection cache of compiled SQL statements
+STATEMENT_CACHE_SIZE = 256
+# Seconds a writer waits for a competing transaction before "database is locked"
+BUSY_TIMEOUT = 30
+
+# Insert a bidder, or merge it into the row with the same normalised name.
+# Parameters: name, contact, address, last_used, created_at (None = now);
+# last_used only moves forward and created_at only moves back.
+BIDDER_UPSERT_SQL = '''
+    INSERT INTO bidders (name, contact, address, last_used, created_at)
+    VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+    ON CONFLICT (lower(trim(name))) DO UPDATE
+    SET contact = CASE WHEN excluded.contact != '' THEN excluded.contact ELSE contact END,
+        address = CASE WHEN excluded.address != '' THEN excluded.address ELSE address END,
+        last_used = MAX(last_used, excluded.last_used),
+        created_at = MIN(created_at, excluded.created_at)
+'''
+
+# How much one year since last use counts against a bm25 match score
+RECENCY_WEIGHT_PER_YEAR = 1.0
 
 class DatabaseManager:
     def __init__(self, db_path: str = "tender_bidders.db"):
         self.db_path = db_path
+        # Trigram index over bidder names, built on first fuzzy search.
+        # _fuzzy_signature is the (row count, max id) the index reflects.
+        self._fuzzy = TrigramIndex()
+        self._fuzzy_signature = None
+        self.fts_enabled = False
+        # False when the unique name index is missing and upserts fall back
+        # to select-then-update
+        self.upsert_enabled = False
+        # One connection per thread; Streamlit runs every rerun on a fresh
+        # script thread, so connections of finished threads are closed when
+        # the next connection is opened (see _close_dead_connections)
+        self._local = threading.local()
+        self._connections: List[tuple] = []
+        self._connections_lock = threading.Lock()
+        self._fuzzy_lock = threading.Lock()
+        # Callbacks run after every committed write (used to invalidate read caches)
+        self._write_listeners = []
         self.init_database()
     
+    def add_write_listener(self, callback):
+        """Call callback() after every write made through this manager"""
+        self._write_listeners.append(callback)
+    
+    def notify_write(self):
+        """Tell listeners the stored bidders changed"""
+        for callback in self._write_listeners:
+            callback()
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, opening it on first use.
+        
+        Use it as a context manager for a transaction: the block commits on
+        success and rolls back on error, but the connection stays open until
+        the thread ends.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self._close_dead_connections()
+            # check_same_thread=False only so that a finished thread's
+            # connection can be closed from another thread; each connection
+            # is still used by its own thread alone
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                check_same_thread=False
+            )
+            # WAL lets readers proceed while a writer commits; NORMAL sync is safe under WAL
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append((weakref.ref(threading.current_thread()), conn))
+        return conn
+    
+    def _close_dead_connections(self):
+        """Close the connections of threads that have finished"""
+        with self._connections_lock:
+            alive = []
+            for thread_ref, conn in self._connections:
+                thread = thread_ref()
+                if thread is not None and thread.is_alive():
+                    alive.append((thread_ref, conn))
+                else:
+                    conn.close()
+            self._connections = alive
+    
+    @property
+    def open_connections(self) -> int:
+        """Number of connections currently held open"""
+        self._close_dead_connections()
+        with self._connections_lock:
+            return len(self._connections)
+    
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with self._connections_lock:
+                self._connections = [entry for entry in self._connections if entry[1] is not conn]
+            conn.close()
+            self._local.conn = None
+    
+    def close_all(self):
+        """Close every connection this manager opened, in any thread"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
     def init_database(self):
         """Initialize SQLite database with bidders table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS bidders (
@@ -29,9 +222,74 @@ class DatabaseManager:
                     )
                 ''')
                 conn.commit()
+                self._migrate(conn)
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'bidders_fts'")
+                self.fts_enabled = cursor.fetchone() is not None
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_bidders_name_key'")
+                self.upsert_enabled = cursor.fetchone() is not None
         except Exception as e:
             print(f"Error initializing database: {str(e)}")
     
+    def _migrate(self, conn):
+        """Bring an existing database file up to the latest schema"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, (feature, script) in enumerate(SCHEMA_MIGRATIONS[version:], version + 1):
+            if feature and not MIGRATION_FEATURES[feature](conn):
+                print(f"Skipping schema migration {number}: SQLite {feature} is not available")
+                script = ''
+            try:
+                conn.executescript(f"BEGIN; {script} PRAGMA user_version = {number}; COMMIT;")
+            except Exception as e:
+                conn.rollback()
+                print(f"Error applying schema migration {number}: {str(e)}")
+                return
+    
+    def upsert_bidders(self, conn, rows: Iterable[tuple]) -> None:
+        """
+        Insert bidders or merge them into existing rows with the same normalised name.
+        
+        Args:
+            conn: Connection inside the caller's transaction
+            rows: (name, contact, address, last_used, created_at) tuples;
+                None timestamps mean now
+        """
+        if self.upsert_enabled:
+            conn.executemany(BIDDER_UPSERT_SQL, rows)
+            return
+        
+        # Without the unique name index ON CONFLICT cannot match, so look
+        # each name up first
+        for name, contact, address, last_used, created_at in rows:
+            existing = conn.execute('''
+                SELECT id FROM bidders WHERE lower(trim(name)) = lower(trim(?))
+                ORDER BY last_used DESC, id DESC LIMIT 1
+            ''', (name,)).fetchone()
+            if existing is None:
+                conn.execute('''
+                    INSERT INTO bidders (name, contact, address, last_used, created_at)
+                    VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+                ''', (name, contact, address, last_used, created_at))
+            else:
+                conn.execute('''
+                    UPDATE bidders
+                    SET contact = CASE WHEN ? != '' THEN ? ELSE contact END,
+                        address = CASE WHEN ? != '' THEN ? ELSE address END,
+                        last_used = MAX(last_used, COALESCE(?, CURRENT_TIMESTAMP)),
+                        created_at = MIN(created_at, COALESCE(?, CURRENT_TIMESTAMP))
+                    WHERE id = ?
+                ''', (contact, contact, address, address, last_used, created_at, existing[0]))
+    
+    @staticmethod
+    def _row_to_bidder(row) -> Dict:
+        """Convert an (id, name, contact, last_used, created_at) row to a dict"""
+        return {
+            'id': row[0],
+            'name': row[1],
+            'contact': row[2] or '',
+            'last_used': row[3],
+            'created_at': row[4]
+        }
+    
     def store_bidder(self, name: str, contact: str = "") -> bool:
         """Store or update bidder credentials"""
         try:
@@ -41,35 +299,26 @@ class DatabaseManager:
             if not name:
                 return False
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if bidder already exists
-                cursor.execute('SELECT id FROM bidders WHERE name = ?', (name,))
-                existing = cursor.fetchone()
+                # Insert, or refresh last_used (and contact if given) for a known name
+                self.upsert_bidders(conn, [(name, contact, '', None, None)])
                 
-                if existing:
-                    # Update last_used timestamp and contact if provided
-                    if contact:
-                        cursor.execute('''
-                            UPDATE bidders 
-                            SET contact = ?, last_used = CURRENT_TIMESTAMP 
-                            WHERE name = ?
-                        ''', (contact, name))
-                    else:
+                with self._fuzzy_lock:
+                    if self._fuzzy_signature is not None:
                         cursor.execute('''
-                            UPDATE bidders 
-                            SET last_used = CURRENT_TIMESTAMP 
-                            WHERE name = ?
+                            SELECT id FROM bidders WHERE lower(trim(name)) = lower(trim(?))
+                            ORDER BY last_used DESC, id DESC LIMIT 1
                         ''', (name,))
-                else:
-                    # Insert new bidder
-                    cursor.execute('''
-                        INSERT INTO bidders (name, contact) 
-                        VALUES (?, ?)
-                    ''', (name, contact))
+                        bidder_id = cursor.fetchone()[0]
+                        if bidder_id not in self._fuzzy:
+                            self._fuzzy.add(bidder_id, name)
+                            count, max_id = self._fuzzy_signature
+                            self._fuzzy_signature = (count + 1, max(max_id or 0, bidder_id))
                 
                 conn.commit()
+                self.notify_write()
                 return True
                 
         except Exception as e:
@@ -79,7 +328,7 @@ class DatabaseManager:
     def get_recent_bidders(self, limit: int = 50) -> List[Dict]:
         """Get recent bidders ordered by last_used"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, name, contact, last_used, created_at
@@ -107,12 +356,29 @@ class DatabaseManager:
             return []
     
     def search_bidders(self, search_term: str) -> List[Dict]:
-        """Search bidders by name"""
+        """Search bidders by name: full-text prefix match first, substring match as fallback"""
         try:
-            search_term = f"%{search_term.strip()}%"
+            tokens = re.findall(r'\w+', search_term)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
+                
+                if self.fts_enabled and tokens:
+                    # Every word must prefix-match; rank by bm25 penalised by time since last use
+                    match_query = ' '.join(f'"{token}"*' for token in tokens)
+                    cursor.execute('''
+                        SELECT b.id, b.name, b.contact, b.last_used, b.created_at
+                        FROM bidders_fts
+                        JOIN bidders b ON b.id = bidders_fts.rowid
+                        WHERE bidders_fts MATCH ?
+                        ORDER BY bm25(bidders_fts)
+                            + ? * COALESCE(julianday('now') - julianday(b.last_used), 3650) / 365.0
+                    ''', (match_query, RECENCY_WEIGHT_PER_YEAR))
+                    results = cursor.fetchall()
+                    if results:
+                        return [self._row_to_bidder(row) for row in results]
+                
+                search_term = f"%{search_term.strip()}%"
                 cursor.execute('''
                     SELECT id, name, contact, last_used, created_at
                     FROM bidders 
@@ -138,15 +404,64 @@ class DatabaseManager:
             print(f"Error searching bidders: {str(e)}")
             return []
     
+    def _sync_fuzzy_index(self, cursor) -> None:
+        """Rebuild the trigram index if the table changed behind our back."""
+        cursor.execute('SELECT COUNT(*), MAX(id) FROM bidders')
+        signature = tuple(cursor.fetchone())
+        if signature == self._fuzzy_signature:
+            return
+        self._fuzzy.clear()
+        for bidder_id, name in cursor.execute('SELECT id, name FROM bidders'):
+            self._fuzzy.add(bidder_id, name)
+        self._fuzzy_signature = signature
+    
+    def fuzzy_search_bidders(self, search_term: str, limit: int = 10,
+                             min_score: float = 0.3) -> List[Dict]:
+        """Typo-tolerant search by name, best match first, with 'match_score'"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                with self._fuzzy_lock:
+                    self._sync_fuzzy_index(cursor)
+                    matches = self._fuzzy.search(search_term, limit, min_score)
+                if not matches:
+                    return []
+                
+                scores = dict(matches)
+                placeholders = ','.join('?' * len(scores))
+                cursor.execute(f'''
+                    SELECT id, name, contact, last_used, created_at
+                    FROM bidders 
+                    WHERE id IN ({placeholders})
+                ''', list(scores))
+                
+                bidders = []
+                for row in cursor.fetchall():
+                    bidders.append({
+                        'id': row[0],
+                        'name': row[1],
+                        'contact': row[2] or '',
+                        'last_used': row[3],
+                        'created_at': row[4],
+                        'match_score': scores[row[0]]
+                    })
+                
+                bidders.sort(key=lambda b: -b['match_score'])
+                return bidders
+                
+        except Exception as e:
+            print(f"Error fuzzy searching bidders: {str(e)}")
+            return []
+    
     def get_bidder_by_name(self, name: str) -> Optional[Dict]:
         """Get specific bidder by name"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, name, contact, last_used, created_at
                     FROM bidders 
-                    WHERE name = ?
+                    WHERE lower(trim(name)) = lower(trim(?))
                 ''', (name.strip(),))
                 
                 result = cursor.fetchone()
@@ -169,24 +484,47 @@ class DatabaseManager:
     def delete_bidder(self, bidder_id: int) -> bool:
         """Delete bidder by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM bidders WHERE id = ?', (bidder_id,))
                 conn.commit()
+                with self._fuzzy_lock:
+                    if cursor.rowcount > 0 and bidder_id in self._fuzzy:
+                        self._fuzzy.remove(bidder_id)
+                        count, max_id = self._fuzzy_signature
+                        self._fuzzy_signature = (count - 1, max_id)
+                if cursor.rowcount > 0:
+                    self.notify_write()
                 return cursor.rowcount > 0
                 
         except Exception as e:
             print(f"Error deleting bidder: {str(e)}")
             return False
     
+    def iter_bidders(self, batch_size: int = 500) -> Iterator[Dict]:
+        """Yield every bidder, most recently used first, fetching batch_size rows at a time"""
+        cursor = self.get_connection().cursor()
+        try:
+            cursor.execute('''
+                SELECT id, name, contact, last_used, created_at
+                FROM bidders 
+                ORDER BY last_used DESC
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_bidder(row)
+        finally:
+            cursor.close()
+    
     def export_bidders(self) -> str:
         """Export all bidders as JSON"""
         try:
-            bidders = self.get_recent_bidders(limit=10000)  # Get all bidders
-            
             export_data = {
                 'export_date': datetime.now().isoformat(),
-                'bidders': bidders
+                'bidders': list(self.iter_bidders())
             }
             
             return json.dumps(export_data, indent=2)
@@ -195,26 +533,73 @@ class DatabaseManager:
             print(f"Error exporting bidders: {str(e)}")
             return "{}"
     
+    def export_bidders_stream(self, fp: TextIO, fmt: str = 'jsonl') -> int:
+        """
+        Stream all bidders to a text file object without holding them in memory.
+        
+        Args:
+            fp: Writable text stream (open with newline='' for CSV)
+            fmt: 'jsonl' (one JSON object per line) or 'csv'
+            
+        Returns:
+            Number of bidders written
+        """
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError("Unsupported export format. Use 'jsonl' or 'csv'")
+        
+        count = 0
+        if fmt == 'csv':
+            writer = csv.DictWriter(fp, fieldnames=BIDDER_FIELDS)
+            writer.writeheader()
+            for bidder in self.iter_bidders():
+                writer.writerow(bidder)
+                count += 1
+        else:
+            for bidder in self.iter_bidders():
+                fp.write(json.dumps(bidder, ensure_ascii=False) + '\n')
+                count += 1
+        return count
+    
+    def bulk_store_bidders(self, bidders: Iterable[Dict]) -> int:
+        """
+        Upsert many bidders in a single transaction.
+        
+        Args:
+            bidders: Dicts with a 'name' and optional 'contact'
+            
+        Returns:
+            Number of records written (records without a name are skipped)
+        """
+        rows = []
+        for bidder in bidders:
+            name = str(bidder.get('name') or '').strip()
+            if name:
+                rows.append((name, str(bidder.get('contact') or '').strip(), '', None, None))
+        if not rows:
+            return 0
+        
+        with self.get_connection() as conn:
+            self.upsert_bidders(conn, rows)
+        
+        # Let the next fuzzy search rebuild its index in one pass
+        with self._fuzzy_lock:
+            self._fuzzy_signature = None
+        self.notify_write()
+        return len(rows)
+    
     def import_bidders(self, json_data: bytes) -> int:
-        """Import bidders from JSON data"""
+        """Import bidders from JSON ({'bidders': [...]}) or JSON Lines data"""
         try:
-            data = json.loads(json_data.decode('utf-8'))
+            text = json_data.decode('utf-8')
+            try:
+                data = json.loads(text)
+            except ValueError:
+                data = {'bidders': [json.loads(line) for line in text.splitlines() if line.strip()]}
             
-            if 'bidders' not in data:
+            if not isinstance(data, dict) or 'bidders' not in data:
                 return 0
             
-            imported_count = 0
-            
-            for bidder in data['bidders']:
-                if 'name' in bidder:
-                    success = self.store_bidder(
-                        bidder['name'], 
-                        bidder.get('contact', '')
-                    )
-                    if success:
-                        imported_count += 1
-            
-            return imported_count
+            return self.bulk_store_bidders(b for b in data['bidders'] if isinstance(b, dict))
             
         except Exception as e:
             print(f"Error importing bidders: {str(e)}")
@@ -223,7 +608,7 @@ class DatabaseManager:
     def get_bidder_stats(self) -> Dict:
         """Get statistics about stored bidders"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Total bidders
@@ -258,7 +643,7 @@ class DatabaseManager:
     def cleanup_old_bidders(self, days: int = 365) -> int:
         """Remove bidders not used for specified days"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 # Compute cutoff timestamp in Python to avoid string formatting in SQL
                 cutoff_ts = (datetime.utcnow() - timedelta(days=int(days))).strftime('%Y-%m-%d %H:%M:%S')
@@ -268,6 +653,8 @@ class DatabaseManager:
                 )
                 
                 conn.commit()
+                if cursor.rowcount:
+                    self.notify_write()
                 return cursor.rowcount
                 
         except Exception as e:
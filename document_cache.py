@@ -0,0 +1,162 @@
+"""
+Document Cache for Tender Processing System
+Caches rendered PDF/DOCX bytes by a hash of the generator, template
+version, work data and bidder list
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from tiered_cache import SharedInstance, TieredCache
+
+# Bump when a generator's output changes for the same inputs so that stale
+# on-disk documents are never served.
+DOCUMENT_CACHE_VERSION = "1"
+
+
+def _normalise(value: Any) -> Any:
+    """Canonical JSON-able form: sorted mappings, lists for sequences, floats for numbers."""
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if hasattr(value, 'item') and callable(value.item):  # numpy scalars
+        value = value.item()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return str(value)
+
+
+class DocumentCache(TieredCache):
+    """Two-tier (memory LRU + optional disk LRU) cache of rendered documents."""
+
+    label = 'document cache'
+    file_prefix = 'doc_'
+    file_suffix = '.bin'
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_memory_bytes: Size budget for documents kept in memory
+            cache_dir: Directory for the on-disk tier; None disables it
+            max_disk_bytes: Size budget for the on-disk tier
+        """
+        super().__init__(max_memory_bytes, cache_dir, max_disk_bytes)
+        self.max_memory_bytes = max_memory_bytes
+
+    @staticmethod
+    def make_key(document: str, template_version: str, *inputs: Any) -> str:
+        """
+        Return the cache key for one rendered document.
+
+        Args:
+            document: Generator and method name, e.g. 'PDFGenerator.generate_work_order_pdf'
+            template_version: Version of the template the generator renders from
+            inputs: Work data, bidders and any other arguments
+
+        The current date is part of the key because documents print it.
+        """
+        payload = json.dumps(
+            [DOCUMENT_CACHE_VERSION, document, template_version, date.today().isoformat(), _normalise(inputs)],
+            sort_keys=True, ensure_ascii=False, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _weight(self, data: bytes) -> int:
+        return len(data)
+
+    def _encode(self, data: bytes) -> bytes:
+        return data
+
+    def _decode(self, data: bytes) -> bytes:
+        return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached document for key, or None."""
+        return self._lookup(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a rendered document under key in every enabled tier."""
+        self._store(key, data)
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Return the document for key, calling render only on a cache miss."""
+        data = self.get(key)
+        if data is not None:
+            logging.info(f"Document cache hit for {key[:12]}")
+            return data
+
+        data = render()
+        if data:
+            self.put(key, data)
+        return data
+
+
+_shared_cache = SharedInstance(lambda: DocumentCache(cache_dir=os.getenv('DOCUMENT_CACHE_DIR') or None))
+
+
+def get_document_cache() -> DocumentCache:
+    """
+    Return the process-wide cache shared by all Streamlit sessions.
+
+    The disk tier is enabled by setting DOCUMENT_CACHE_DIR.
+    """
+    return _shared_cache()
+
+
+_source_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def source_version(module_name: str) -> str:
+    """
+    Return the SHA-256 of a module's source file.
+
+    For generators whose layout lives in code (ReportLab, python-docx): any
+    edit to the module changes their cache_version(). Digests are kept per
+    (path, mtime, size), so a module reloaded after an edit is re-hashed.
+    """
+    path = sys.modules[module_name].__file__
+    stat = os.stat(path)
+    signature = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _source_digests.get(signature)
+    if digest is None:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _source_digests[signature] = digest
+    return digest
+
+
+def document_cache_key(generator: Any, method_name: str, *inputs: Any) -> str:
+    """
+    Return the cache key for generator.method_name(*inputs).
+
+    Generators expose cache_version() so that editing a template (or, for
+    generators whose layout is code, their module; see source_version)
+    invalidates their documents.
+    """
+    version = generator.cache_version() if hasattr(generator, 'cache_version') else ''
+    return DocumentCache.make_key(f"{type(generator).__name__}.{method_name}", version, *inputs)
+
+
+def cached_document(method: Callable[..., bytes]) -> Callable[..., bytes]:
+    """Decorate a generate_*(work, bidders) method so its output is served from the document cache."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            key = document_cache_key(self, method.__name__, *args, *([kwargs] if kwargs else []))
+        except Exception as e:
+            logging.warning(f"Not caching {method.__name__}: {e}")
+            return method(self, *args, **kwargs)
+        return get_document_cache().get_or_render(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -5,9 +5,12 @@ from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.oxml.shared import OxmlElement, qn
 from datetime import datetime
 from typing import Dict, Any, List
+import copy
 import io
 import logging
 from date_utils import DateUtils
+from asset_cache import get_asset_cache
+from document_cache import cached_document, source_version
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -17,9 +20,13 @@ class DocumentGenerator:
     def __init__(self):
         self.date_utils = DateUtils()
     
-    def set_table_borders(self, table):
-        """Add borders to table."""
-        tbl = table._tbl
+    def cache_version(self):
+        """Hash of this module's source: the layout is code, so editing it invalidates cached documents."""
+        return source_version(__name__)
+    
+    @staticmethod
+    def _build_table_borders():
+        """Build the w:tblBorders element shared by every table."""
         tblBorders = OxmlElement('w:tblBorders')
         
         for border_name in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
@@ -30,8 +37,14 @@ class DocumentGenerator:
             border.set(qn('w:color'), '000000')
             tblBorders.append(border)
         
-        tbl.tblPr.append(tblBorders)
+        return tblBorders
+    
+    def set_table_borders(self, table):
+        """Add borders to table."""
+        borders = get_asset_cache().static('docx_table_borders', self._build_table_borders)
+        table._tbl.tblPr.append(copy.deepcopy(borders))
     
+    @cached_document
     def generate_comparative_statement_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate comparative statement in Word format matching PWD layout."""
         
@@ -190,6 +203,7 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @cached_document
     def generate_scrutiny_sheet_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate scrutiny sheet in Word format matching PWD layout."""
         
@@ -268,6 +282,7 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @cached_document
     def generate_letter_of_acceptance_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Letter of Acceptance in Word format."""
         
@@ -355,6 +370,7 @@ class DocumentGenerator:
         doc_buffer.seek(0)
         return doc_buffer.getvalue()
     
+    @cached_document
     def generate_work_order_doc(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Work Order in Word format."""
         
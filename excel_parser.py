@@ -8,16 +8,33 @@ import os
 import json
 from dateutil.parser import parse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('excel_parser.log'),
-        logging.StreamHandler()
-    ]
-)
+# Handlers are left to the application (see app.py); importing the parser
+# must not create log files
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Row layout of the statutory NIT sheet (0-based)
+NIT_METADATA_ROWS = 4     # NIT number, NIT date, receipt date, opening date
+NIT_METADATA_COLUMN = 2   # value column for the metadata rows
+NIT_HEADER_ROW = 4        # work table header; work rows follow
+
+# Workbook formats openpyxl can read; every NIT entry point (uploaders,
+# folder ingestion) accepts exactly these
+NIT_FILE_EXTENSIONS = ('xlsx', 'xlsm')
+
+# Marks a metadata cell that lies outside the sheet (as opposed to an empty cell)
+_MISSING = object()
+
+# Work-table column aliases, resolved once per sheet (first match wins per row)
+WORK_COLUMN_ALIASES = {
+    'item_no': ('ITEM NO.', 'ITEM NO'),
+    'work_name': ('NAME OF WORK', 'WORK NAME'),
+    'estimated_cost': ('ESTIMATED COST RS. IN LACS',),
+    'g_schedule_amount': ('G-SCHEDULE AMOUNT RS',),
+    'earnest_money': ('EARNEST MONEY RS.',),
+    'time_completion': ('TIME OF COMPLETION IN MONTH',),
+}
+NUMERIC_WORK_COLUMNS = ('estimated_cost', 'g_schedule_amount', 'earnest_money')
 
 class ExcelParser:
     def __init__(self):
@@ -34,12 +51,144 @@ class ExcelParser:
             print(f"Error converting Excel date {excel_date}: {str(e)}")
             return str(excel_date)
 
+    @staticmethod
+    def _convert_cell(value):
+        """Normalise a raw openpyxl value the way pandas.read_excel does."""
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    def _stream_nit_workbook(self, file_path):
+        """
+        Open a NIT workbook once in openpyxl read-only mode.
+        
+        Args:
+            file_path: Path or binary file-like object of the .xlsx workbook
+            
+        Returns:
+            tuple: (metadata, header, rows) where metadata holds the four
+            metadata cells (_MISSING where absent or blank; None if the sheet
+            has no values at all), header is the list of work-table column
+            names and rows lazily yields one dict per non-blank work row. The
+            workbook is closed once rows is exhausted.
+        """
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            row_iter = sheet.iter_rows(values_only=True)
+
+            # Blank metadata cells fall back per field like missing ones
+            metadata = []
+            has_values = False
+            for _ in range(NIT_METADATA_ROWS):
+                values = next(row_iter, None)
+                if values is None:
+                    break
+                has_values = has_values or any(value is not None for value in values)
+                value = self._convert_cell(values[NIT_METADATA_COLUMN]) if len(values) > NIT_METADATA_COLUMN else None
+                metadata.append(_MISSING if value is None else value)
+            metadata.extend([_MISSING] * (NIT_METADATA_ROWS - len(metadata)))
+
+            for _ in range(NIT_HEADER_ROW - NIT_METADATA_ROWS):
+                values = next(row_iter, None) or ()
+                has_values = has_values or any(value is not None for value in values)
+            header_values = next(row_iter, None) or ()
+            # Only a sheet without a single value counts as empty; a blank
+            # header row means there is no work table to read anyway
+            if not has_values and not any(value is not None for value in header_values) \
+                    and not any(value is not None for values in row_iter for value in values):
+                workbook.close()
+                return None, [], iter(())
+            header = [
+                str(value).strip() if value is not None else None
+                for value in header_values
+            ]
+        except Exception:
+            workbook.close()
+            raise
+
+        def _rows():
+            try:
+                for values in row_iter:
+                    record = {}
+                    for name, value in zip(header, values):
+                        if name is None:
+                            continue
+                        value = self._convert_cell(value)
+                        if value is not None:
+                            record[name] = value
+                    if record:
+                        yield record
+            finally:
+                workbook.close()
+
+        return metadata, [name for name in header if name is not None], _rows()
+
+    @staticmethod
+    def _resolve_column(work_df, aliases):
+        """Return the first alias column, filled row-wise from later aliases."""
+        present = [name for name in aliases if name in work_df.columns]
+        if not present:
+            return pd.Series(None, index=work_df.index, dtype=object)
+        column = work_df[present[0]]
+        for name in present[1:]:
+            column = column.combine_first(work_df[name])
+        return column
+
+    def extract_work_columns(self, work_df):
+        """
+        Extract normalised work fields from the work table column by column.
+        
+        Args:
+            work_df (pd.DataFrame): Work rows keyed by the sheet's header names
+            
+        Returns:
+            tuple: (DataFrame with item_no, work_name, estimated_cost (in Rs),
+            g_schedule_amount, earnest_money and time_completion columns,
+            boolean Series marking rows whose amounts are not numeric)
+        """
+        position = pd.Series(range(1, len(work_df) + 1), index=work_df.index).astype(str)
+        columns = {
+            name: self._resolve_column(work_df, aliases)
+            for name, aliases in WORK_COLUMN_ALIASES.items()
+        }
+
+        extracted = pd.DataFrame(index=work_df.index)
+        extracted['item_no'] = columns['item_no'].where(columns['item_no'].notna(), position).astype(str)
+        extracted['work_name'] = columns['work_name'].where(
+            columns['work_name'].notna(), 'Work ' + position
+        ).astype(str)
+
+        invalid_rows = pd.Series(False, index=work_df.index)
+        for name in NUMERIC_WORK_COLUMNS:
+            raw = columns[name]
+            # Numeric cells convert as-is; only text cells go through comma stripping
+            values = pd.to_numeric(raw, errors='coerce').astype(float)
+            text = raw[values.isna() & raw.notna()]
+            if not text.empty:
+                values[text.index] = pd.to_numeric(
+                    text.astype(str).str.replace(',', '', regex=False).str.strip(),
+                    errors='coerce'
+                )
+            invalid_rows |= raw.notna() & values.isna()
+            extracted[name] = values.fillna(0).astype(float)
+        extracted['estimated_cost'] *= 100000
+
+        extracted['time_completion'] = columns['time_completion'].where(
+            columns['time_completion'].notna(), '6 months'
+        ).astype(str)
+        return extracted, invalid_rows
+
     def parse_nit_excel(self, file_path):
         """
         Parse statutory NIT Excel file.
         
         Args:
-            file_path (str): Path to the Excel file to parse
+            file_path (str or file-like): Path or binary stream of the Excel file to parse
             
         Returns:
             dict: Parsed NIT metadata and a list of works
@@ -50,29 +199,26 @@ class ExcelParser:
         logger.info(f"Starting to parse NIT Excel file: {file_path}")
         
         try:
-            # Read Excel file with error handling
+            # Stream the workbook once: metadata rows first, then work rows
             logger.info("Reading Excel file...")
             try:
-                df = pd.read_excel(file_path, header=None, engine='openpyxl')
-                logger.info(f"Excel file read successfully. Shape: {df.shape}")
+                metadata, header, rows = self._stream_nit_workbook(file_path)
+                logger.info(f"Excel file opened in read-only mode. Columns: {len(header)}")
             except Exception as e:
                 logger.error(f"Failed to read Excel file: {str(e)}\n{traceback.format_exc()}")
                 raise ValueError("Failed to read the Excel file. Please ensure it's a valid Excel file.")
             
-            if df.empty:
+            if metadata is None:
                 error_msg = "The uploaded Excel file is empty"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
-                
-            # Log first few rows for debugging
-            logger.debug(f"First 5 rows of raw data:\n{df.head().to_string()}")
 
             # Extract metadata from rows 1-4 (0-based indexing)
             try:
-                nit_number = str(df.iloc[0, 2]) if df.shape[1] > 2 else "Unknown"
-                nit_date = self.excel_date_to_string(df.iloc[1, 2]) if df.shape[1] > 2 else "Unknown"
-                receipt_date = self.excel_date_to_string(df.iloc[2, 2]) if df.shape[1] > 2 else "Unknown"
-                opening_date = self.excel_date_to_string(df.iloc[3, 2]) if df.shape[1] > 2 else "Unknown"
+                nit_number = str(metadata[0]) if metadata[0] is not _MISSING else "Unknown"
+                nit_date = self.excel_date_to_string(metadata[1]) if metadata[1] is not _MISSING else "Unknown"
+                receipt_date = self.excel_date_to_string(metadata[2]) if metadata[2] is not _MISSING else "Unknown"
+                opening_date = self.excel_date_to_string(metadata[3]) if metadata[3] is not _MISSING else "Unknown"
                 
                 logger.info(f"Extracted metadata - NIT: {nit_number}, Date: {nit_date}")
                 logger.info(f"Receipt Date: {receipt_date}, Opening Date: {opening_date}")
@@ -83,10 +229,14 @@ class ExcelParser:
                 raise ValueError("Error reading NIT metadata. Please ensure the Excel file has the correct format with metadata in the first 4 rows.")
 
             # Extract work data from rows 6+ (header at row 5, 0-based index 4)
-            works = []
             try:
                 logger.info("Reading work data from Excel...")
-                work_df = pd.read_excel(file_path, header=4, engine='openpyxl')
+                
+                # Log column names for debugging
+                logger.info(f"Available columns: {header}")
+                
+                # object dtype keeps integral cells as int when a column has gaps
+                work_df = pd.DataFrame(list(rows), columns=header, dtype=object)
                 logger.info(f"Work data read successfully. Shape: {work_df.shape}")
                 
                 if work_df.empty:
@@ -94,40 +244,21 @@ class ExcelParser:
                     logger.error(error_msg)
                     raise ValueError("No work data found. Please ensure the Excel file contains work items starting from row 6.")
                 
-                # Log column names for debugging
-                logger.info(f"Available columns: {work_df.columns.tolist()}")
+                work_columns, invalid_rows = self.extract_work_columns(work_df)
+                if invalid_rows.any():
+                    bad_rows = (work_df.index[invalid_rows.to_numpy()] + 1).tolist()
+                    logger.error(f"Skipping {len(bad_rows)} work rows with non-numeric amounts: {bad_rows}")
                 
-                for idx, row in work_df.iterrows():
-                    try:
-                        work_info = {
-                            'item_no': str(row.get('ITEM NO.', row.get('ITEM NO', str(idx + 1))))
-                        }
-                        # Work name
-                        work_info['work_name'] = str(row.get('NAME OF WORK', row.get('WORK NAME', f'Work {idx + 1}')))
-                        # Numeric fields
-                        def _num(val, default='0'):
-                            return float(str(row.get(val, default)).replace(',', ''))
-                        work_info['estimated_cost'] = _num('ESTIMATED COST RS. IN LACS') * 100000
-                        work_info['g_schedule_amount'] = _num('G-SCHEDULE AMOUNT RS')
-                        work_info['earnest_money'] = _num('EARNEST MONEY RS.')
-                        # Time completion
-                        work_info['time_completion'] = str(row.get('TIME OF COMPLETION IN MONTH', '6 months'))
-                        
-                        works.append({
-                            'work_info': {
-                                'nit_number': nit_number,
-                                'nit_date': nit_date,
-                                'receipt_date': receipt_date,
-                                'opening_date': opening_date,
-                                **work_info
-                            }
-                        })
-                        
-                        logger.debug(f"Processed work item {idx + 1}: {work_info['work_name']}")
-                        
-                    except Exception as work_error:
-                        logger.error(f"Error processing row {idx + 1}: {str(work_error)}\n{traceback.format_exc()}")
-                        continue  # Skip this row but continue with others
+                nit_info = {
+                    'nit_number': nit_number,
+                    'nit_date': nit_date,
+                    'receipt_date': receipt_date,
+                    'opening_date': opening_date,
+                }
+                works = [
+                    {'work_info': {**nit_info, **work_info}}
+                    for work_info in work_columns[~invalid_rows].to_dict('records')
+                ]
                 
                 if not works:
                     error_msg = "No valid work items found in the Excel file"
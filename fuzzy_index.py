@@ -0,0 +1,95 @@
+"""
+Fuzzy Name Index for Tender Processing System
+Typo-tolerant bidder name matching using a trigram inverted index
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+# Honorifics and punctuation that vary between entries of the same contractor
+_PREFIX_PATTERN = re.compile(r"^\s*(m\s*/\s*s\.?|messrs\.?|shri|sh\.)\s+", re.IGNORECASE)
+_NON_WORD_PATTERN = re.compile(r"[^\w]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a name, drop a leading M/s-style prefix and collapse punctuation."""
+    name = _PREFIX_PATTERN.sub('', name or '')
+    return ' '.join(_NON_WORD_PATTERN.sub(' ', name.casefold()).split())
+
+
+def trigrams(name: str) -> Set[str]:
+    """Return the padded character trigrams of each word in a normalised name."""
+    grams = set()
+    for word in normalize_name(name).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Incrementally maintained trigram index mapping keys to names."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._grams: Dict[Hashable, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._grams
+
+    def add(self, key: Hashable, name: str) -> None:
+        """Index name under key, replacing any name previously stored for key."""
+        self.remove(key)
+        grams = trigrams(name)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop key from the index if present."""
+        grams = self._grams.pop(key, None)
+        if not grams:
+            return
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._grams.clear()
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[Hashable, float]]:
+        """
+        Rank indexed keys by trigram similarity to query.
+
+        Args:
+            query: Name as typed by the user
+            limit: Maximum number of matches
+            min_score: Minimum Dice coefficient (0-1) for a match
+
+        Returns:
+            List of (key, score) tuples, best match first
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: Dict[Hashable, int] = defaultdict(int)
+        for gram in query_grams:
+            for key in self._postings.get(gram, ()):
+                shared[key] += 1
+
+        matches = []
+        for key, count in shared.items():
+            score = 2.0 * count / (len(query_grams) + len(self._grams[key]))
+            if score >= min_score:
+                matches.append((key, round(score, 4)))
+
+        matches.sort(key=lambda match: (-match[1], str(match[0])))
+        return matches[:limit]
@@ -12,6 +12,8 @@ from pathlib import Path
 import logging
 from typing import Dict, List, Optional, Tuple
 
+from template_registry import get_template_registry
+
 class LaTeXGenerator:
     """Enhanced LaTeX document generator with template integration."""
     
@@ -213,21 +215,15 @@ class LaTeXGenerator:
             raise FileNotFoundError(f"Template not found: {template_path}")
         
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return get_template_registry(self.templates_dir).get(template_path.name).text
         except Exception as e:
             self.logger.error(f"Error loading template {template_name}: {e}")
             raise
     
     def substitute_template(self, template_content: str, data: Dict[str, str]) -> str:
         """Substitute placeholders in template with actual data."""
-        result = template_content
-        
-        for placeholder, value in data.items():
-            pattern = f"{{{placeholder}}}"
-            result = result.replace(pattern, str(value))
-        
-        return result
+        # Templates are split into segments once; each call is a single join
+        return get_template_registry(self.templates_dir).compile(template_content).render(data)
     
     def generate_document(self, template_name: str, work_data: Dict, bidders: List[Dict], output_filename: Optional[str] = None) -> Tuple[str, str]:
         """Generate a complete LaTeX document from template."""
@@ -0,0 +1,213 @@
+"""
+LaTeX to HTML Precompilation for Tender Processing System
+Converts each template's static LaTeX to HTML once with pandoc and fills
+placeholders straight into that HTML; values pandoc would have to interpret
+fall back to a full conversion
+"""
+
+import hashlib
+import html
+import logging
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Placeholder whose value is LaTeX table rows ("a & b & c \\" per line)
+TABLE_ROWS_PLACEHOLDER = 'BIDDER_TABLE_ROWS'
+
+# Plain words that pandoc copies through to the HTML unchanged
+_VARIABLE_SENTINEL = 'TPLVAR{}X'
+_CELL_SENTINEL = 'TPLCELL{}X'
+_ROWS_SENTINEL = 'TPLROWSX'
+_SENTINEL_PATTERN = re.compile(r"TPLVAR(\d+)X|TPLROWSX")
+_CELL_PATTERN = re.compile(r"TPLCELL(\d+)X")
+
+_TABULAR_PATTERN = re.compile(r"\\begin\{tabular\}\{([^}]*)\}")
+_COLUMN_PATTERN = re.compile(r"[lcr]|[pmb]\{[^}]*\}|X")
+
+# Escapes with a literal HTML equivalent, and anything else pandoc would
+# reinterpret (commands, groups, math, comments, smart punctuation, paragraphs)
+_ESCAPE_PATTERN = re.compile(r"\\([%&_#$])")
+_UNSAFE_PATTERN = re.compile(r"[\\{}$&#^_~%'\"`]|--|\.\.\.|\n\s*\n")
+_CELL_SPLIT_PATTERN = re.compile(r"(?<!\\)&")
+
+
+def fragment_to_html(text: str) -> Optional[str]:
+    """Return the HTML for a plain-text LaTeX fragment, or None if it needs pandoc."""
+    text = str(text)
+    if _UNSAFE_PATTERN.search(_ESCAPE_PATTERN.sub('', text)):
+        return None
+    return html.escape(_ESCAPE_PATTERN.sub(r"\1", text), quote=False)
+
+
+def table_rows_to_cells(rows: str, columns: int) -> Optional[List[List[str]]]:
+    """Split "a & b \\\\" rows into per-cell HTML, or None if any row needs pandoc."""
+    cells = []
+    for line in rows.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if not line.endswith('\\\\'):
+            return None
+        row = [fragment_to_html(cell.strip()) for cell in _CELL_SPLIT_PATTERN.split(line[:-2])]
+        if len(row) != columns or None in row:
+            return None
+        cells.append(row)
+    return cells
+
+
+class PrecompiledHTMLTemplate:
+    """Template HTML split into literal segments and placeholder slots."""
+
+    def __init__(self, segments: List[Tuple[str, Optional[str]]], keys: Iterable[str],
+                 row_segments: Optional[List[Tuple[str, Optional[int]]]] = None, columns: int = 0):
+        """
+        Args:
+            segments: (literal HTML, placeholder key or None) pairs
+            keys: Placeholders the template uses
+            row_segments: (literal HTML, cell index or None) pairs of one table row
+            columns: Cells per table row
+        """
+        self.segments = segments
+        self.keys = frozenset(keys)
+        self.row_segments = row_segments
+        self.columns = columns
+
+    def _render_rows(self, rows: str) -> Optional[str]:
+        cells = table_rows_to_cells(rows, self.columns)
+        if cells is None:
+            return None
+        return ''.join(
+            literal + (row[index] if index is not None else '')
+            for row in cells
+            for literal, index in self.row_segments
+        )
+
+    def render(self, variables: Dict[str, str]) -> Optional[str]:
+        """Fill the placeholders, or return None if any value needs pandoc."""
+        values = {}
+        for key in self.keys:
+            if key not in variables:
+                return None
+            if key == TABLE_ROWS_PLACEHOLDER:
+                value = self._render_rows(str(variables[key]))
+            else:
+                value = fragment_to_html(variables[key])
+            if value is None:
+                return None
+            values[key] = value
+        return ''.join(literal + (values[key] if key else '') for literal, key in self.segments)
+
+
+def _split_segments(text: str, pattern: re.Pattern, slot) -> list:
+    segments = []
+    position = 0
+    for match in pattern.finditer(text):
+        segments.append((text[position:match.start()], slot(match)))
+        position = match.end()
+    segments.append((text[position:], None))
+    return segments
+
+
+def precompile_template(template_text: str, keys: Iterable[str],
+                        convert: Callable[[str], str]) -> Optional[PrecompiledHTMLTemplate]:
+    """
+    Convert a template to HTML once with every placeholder replaced by a sentinel.
+
+    Args:
+        template_text: LaTeX template using {KEY} placeholders
+        keys: Placeholder names that are substituted
+        convert: LaTeX to HTML converter (pandoc)
+
+    Returns:
+        PrecompiledHTMLTemplate, or None if the placeholders do not map
+        cleanly onto the converted HTML
+    """
+    keys = list(keys)
+    pattern = re.compile(r"\{(" + '|'.join(map(re.escape, keys)) + r")\}")
+    used = []
+    columns = 0
+
+    def to_sentinel(match: re.Match) -> str:
+        nonlocal columns
+        key = match.group(1)
+        if key not in used:
+            used.append(key)
+        if key != TABLE_ROWS_PLACEHOLDER:
+            return _VARIABLE_SENTINEL.format(keys.index(key))
+        tabulars = _TABULAR_PATTERN.findall(template_text, 0, match.start())
+        columns = len(_COLUMN_PATTERN.findall(tabulars[-1])) if tabulars else 0
+        return ' & '.join(_CELL_SENTINEL.format(i) for i in range(columns)) + ' \\\\'
+
+    latex = pattern.sub(to_sentinel, template_text)
+    if TABLE_ROWS_PLACEHOLDER in used and (not columns or template_text.count(f'{{{TABLE_ROWS_PLACEHOLDER}}}') != 1):
+        return None
+
+    converted = convert(latex)
+
+    row_segments = None
+    if TABLE_ROWS_PLACEHOLDER in used:
+        first_cell = converted.find(_CELL_SENTINEL.format(0))
+        start = converted.rfind('<tr', 0, first_cell)
+        end = converted.find('</tr>', first_cell)
+        if first_cell < 0 or start < 0 or end < 0:
+            return None
+        end += len('</tr>')
+        row_html = converted[start:end]
+        if sorted(int(i) for i in _CELL_PATTERN.findall(row_html)) != list(range(columns)) \
+                or _CELL_PATTERN.search(converted[:start] + converted[end:]):
+            return None
+        # Keep the newline pandoc puts between rows
+        if converted[end:end + 1] == '\n':
+            row_html += '\n'
+            end += 1
+        row_segments = _split_segments(row_html, _CELL_PATTERN, lambda m: int(m.group(1)))
+        converted = converted[:start] + _ROWS_SENTINEL + converted[end:]
+
+    segments = _split_segments(
+        converted, _SENTINEL_PATTERN,
+        lambda m: keys[int(m.group(1))] if m.group(1) is not None else TABLE_ROWS_PLACEHOLDER
+    )
+    found = {key for _, key in segments if key}
+    if found != set(used):
+        logging.warning(f"Placeholders lost in LaTeX to HTML conversion: {sorted(set(used) - found)}")
+        return None
+    return PrecompiledHTMLTemplate(segments, used, row_segments, columns)
+
+
+class LatexHTMLCache:
+    """Precompiled HTML per template text, shared by every generator in the process."""
+
+    def __init__(self):
+        self._templates: Dict[str, Optional[PrecompiledHTMLTemplate]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, template_text: str, keys: Iterable[str],
+            convert: Callable[[str], str]) -> Optional[PrecompiledHTMLTemplate]:
+        """Return the precompiled template, converting it on first use (None if it cannot be precompiled)."""
+        keys = tuple(keys)
+        cache_key = hashlib.sha256('\0'.join((template_text,) + keys).encode('utf-8')).hexdigest()
+        with self._lock:
+            if cache_key in self._templates:
+                return self._templates[cache_key]
+        try:
+            precompiled = precompile_template(template_text, keys, convert)
+        except Exception as e:
+            # Not cached: the converter may recover (e.g. pandoc installed later)
+            logging.warning(f"Could not precompile LaTeX template: {e}")
+            return None
+        with self._lock:
+            self._templates[cache_key] = precompiled
+        return precompiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+
+_default_cache = LatexHTMLCache()
+
+
+def get_latex_html_cache() -> LatexHTMLCache:
+    """Return the process-wide precompiled template cache."""
+    return _default_cache
@@ -1,18 +1,116 @@
+import atexit
+import hashlib
 import os
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 import pypandoc
 import weasyprint
 from num2words import num2words
 from date_utils import DateUtils
-import re
-from string import Template
+from latex_html import get_latex_html_cache
+from template_registry import get_template_registry
+from document_cache import cached_document, document_cache_key, get_document_cache
+
+# Placeholders substituted into the LaTeX templates
+TEMPLATE_PLACEHOLDERS = (
+    'NIT_NUMBER', 'NIT_DATE', 'RECEIPT_DATE', 'OPENING_DATE', 'ITEM_NO', 'WORK_NAME',
+    'ESTIMATED_COST', 'EARNEST_MONEY', 'TIME_COMPLETION', 'BIDDER_TABLE_ROWS',
+    'L1_BIDDER_NAME', 'L1_BID_AMOUNT', 'L1_PERCENTAGE', 'L1_BID_AMOUNT_WORDS',
+    'START_DATE', 'COMPLETION_DATE',
+)
+
+# Bulk document name prefix -> (generator method, whether it takes the bidder list or the L1 bidder)
+BULK_DOCUMENTS = (
+    ('Comparative_Statement', 'generate_comparative_statement_pdf', 'bidders'),
+    ('Letter_of_Acceptance', 'generate_letter_acceptance_pdf', 'l1_bidder'),
+    ('Work_Order', 'generate_work_order_pdf', 'l1_bidder'),
+    ('Scrutiny_Sheet', 'generate_scrutiny_sheet_pdf', 'bidders'),
+)
+
+# generate_bulk_pdfs renders in-process when fewer documents than this are
+# left, or when the previous renders of those documents took less than
+# BULK_PARALLEL_MIN_SECONDS in total. Measured on a warm pool a round trip
+# costs ~0.4 ms per document; with the pandoc output precompiled, a
+# document without WeasyPrint renders in ~0.2 ms, so only the PDF step
+# itself is worth shipping to a worker. Spawning the workers (~0.5 s for
+# four, re-importing this module) is paid once per server process.
+BULK_PARALLEL_MIN_DOCUMENTS = 2
+BULK_PARALLEL_MIN_SECONDS = 0.05
+
+_worker_generator = None
+
+_bulk_pool = None
+_bulk_pool_workers = 0
+_bulk_pool_lock = threading.Lock()
+
+
+def _get_bulk_pool(max_workers):
+    """Return the shared bulk-PDF process pool, starting it on first use."""
+    global _bulk_pool, _bulk_pool_workers
+    with _bulk_pool_lock:
+        if _bulk_pool is not None and _bulk_pool_workers != max_workers:
+            _bulk_pool.shutdown(wait=False)
+            _bulk_pool = None
+        if _bulk_pool is None:
+            # Spawned, not forked: the caller is one thread of a multi-threaded
+            # Streamlit server, and a fork taken while another thread holds the
+            # logging, sqlite or cache locks leaves those locks held forever
+            # in the child
+            _bulk_pool = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+            _bulk_pool_workers = max_workers
+        return _bulk_pool
+
+
+def _discard_bulk_pool(pool):
+    """Drop a pool that broke so the next call starts a fresh one."""
+    global _bulk_pool
+    with _bulk_pool_lock:
+        if _bulk_pool is pool:
+            _bulk_pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_bulk_pool():
+    """Stop the shared bulk-PDF worker processes (also run at interpreter exit)."""
+    global _bulk_pool
+    with _bulk_pool_lock:
+        pool, _bulk_pool = _bulk_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_bulk_pool)
+
+
+def _generate_bulk_document(template_dir, method_name, work_data, bidder_arg):
+    """Worker: render one bulk document, returning (pdf bytes, seconds, error message)."""
+    global _worker_generator
+    started = time.perf_counter()
+    try:
+        if _worker_generator is None:
+            _worker_generator = LatexPDFGenerator()
+        _worker_generator.template_dir = template_dir
+        pdf = getattr(_worker_generator, method_name)(work_data, bidder_arg)
+        return pdf, time.perf_counter() - started, None
+    except Exception as e:
+        return None, time.perf_counter() - started, str(e)
+
 
 class LatexPDFGenerator:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.date_utils = DateUtils()
         self.template_dir = os.path.join(os.path.dirname(__file__), 'latex_templates')
+        self.last_bulk_timings = {}
+        self.last_bulk_errors = {}
+        # Latest measured render time per bulk generator method
+        self._bulk_method_seconds = {}
         
         # Ensure Pandoc is available for LaTeX->HTML conversion
         try:
@@ -27,8 +125,7 @@ class LatexPDFGenerator:
     def _load_template(self, template_name):
         template_path = os.path.join(self.template_dir, template_name)
         try:
-            with open(template_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return get_template_registry(self.template_dir).get(template_name).text
         except FileNotFoundError:
             self.logger.error(f"Template not found: {template_path}")
             raise
@@ -36,6 +133,14 @@ class LatexPDFGenerator:
             self.logger.error(f"Error loading template {template_name}: {str(e)}")
             raise
 
+    def cache_version(self):
+        """Hash of the template files, so editing a template invalidates cached documents."""
+        registry = get_template_registry(self.template_dir)
+        digest = hashlib.sha256()
+        for name in registry.names():
+            digest.update(registry.get(name).text.encode('utf-8'))
+        return digest.hexdigest()
+
     def _prepare_common_variables(self, work_data, l1_bidder=None, bidders=None):
         if not work_data or 'work_info' not in work_data:
             self.logger.error("Invalid work_data: missing or None")
@@ -58,7 +163,7 @@ class LatexPDFGenerator:
             variables.update({
                 'L1_BIDDER_NAME': l1_bidder.get('name', 'Unknown'),
                 'L1_BID_AMOUNT': f"{l1_bidder.get('bid_amount', 0):,.2f}",
-                'L1_PERCENTAGE': f"{l1_bidder.get('percentage', 0):.2f}%",
+                'L1_PERCENTAGE': f"{l1_bidder.get('percentage', 0):.2f}\\%",
                 'L1_BID_AMOUNT_WORDS': num2words(l1_bidder.get('bid_amount', 0), lang='en_IN').title().replace(' And ', ' ')
             })
         
@@ -75,38 +180,50 @@ class LatexPDFGenerator:
         return variables
 
     def _render_template(self, template_text: str, variables: dict) -> str:
-        placeholder_keys = (
-            'NIT_NUMBER|NIT_DATE|RECEIPT_DATE|OPENING_DATE|ITEM_NO|WORK_NAME|'
-            'ESTIMATED_COST|EARNEST_MONEY|TIME_COMPLETION|BIDDER_TABLE_ROWS|'
-            'L1_BIDDER_NAME|L1_BID_AMOUNT|L1_PERCENTAGE|L1_BID_AMOUNT_WORDS|'
-            'START_DATE|COMPLETION_DATE'
+        # Compiled once per template; \begin/\end balance is checked when it is loaded
+        template = get_template_registry(self.template_dir).compile(template_text)
+        return template.render({key: variables[key] for key in TEMPLATE_PLACEHOLDERS if key in variables})
+
+    def _save_debug_html(self, html_content):
+        # Only write debug HTML if explicitly enabled
+        if os.getenv('LATEX_DEBUG') == '1':
+            with open('debug_output.html', 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            self.logger.info("Saved debug HTML to debug_output.html")
+
+    def _pandoc_to_html(self, latex_content):
+        return pypandoc.convert_text(
+            latex_content, 'html', format='latex', extra_args=['--standalone', '--mathjax', '--quiet']
         )
-        pattern = re.compile(r"\{(" + placeholder_keys + r")\}")
-        converted = pattern.sub(r"${\1}", template_text)
-        rendered = Template(converted).safe_substitute(variables)
-        # Basic sanity checks: matching \begin and \end blocks
-        begins = len(re.findall(r"\\begin\{[^}]+\}", rendered))
-        ends = len(re.findall(r"\\end\{[^}]+\}", rendered))
-        if begins != ends:
-            self.logger.warning(f"Rendered LaTeX begin/end mismatch: begin={begins}, end={ends}")
-        return rendered
 
     def convert_latex_to_html(self, latex_content):
         try:
-            html_content = pypandoc.convert_text(
-                latex_content, 'html', format='latex', extra_args=['--standalone', '--mathjax', '--quiet']
-            )
-            # Only write debug HTML if explicitly enabled
-            if os.getenv('LATEX_DEBUG') == '1':
-                with open('debug_output.html', 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                self.logger.info("Saved debug HTML to debug_output.html")
+            html_content = self._pandoc_to_html(latex_content)
+            self._save_debug_html(html_content)
             return html_content
         except Exception as e:
             self.logger.error(f"Error converting LaTeX to HTML: {str(e)}")
             # Re-raise to trigger fallback at call sites
             raise
 
+    def render_html(self, template, variables):
+        """
+        Render a template straight to HTML.
+
+        The template's static LaTeX is converted by pandoc once per process;
+        each call only escapes the values into the cached HTML. Values that
+        pandoc would interpret (LaTeX commands, quotes, dashes, ...) fall back
+        to rendering the LaTeX and converting the whole document.
+        """
+        precompiled = get_latex_html_cache().get(template, TEMPLATE_PLACEHOLDERS, self._pandoc_to_html)
+        if precompiled is not None:
+            html_content = precompiled.render(variables)
+            if html_content is not None:
+                self._save_debug_html(html_content)
+                return html_content
+        latex_content = self._render_template(template, variables)
+        return self.convert_latex_to_html(latex_content)
+
     def generate_pdf(self, html_content):
         try:
             pdf = weasyprint.HTML(string=html_content).write_pdf()
@@ -115,20 +232,21 @@ class LatexPDFGenerator:
             self.logger.error(f"Error generating PDF: {str(e)}")
             raise
 
+    @cached_document
     def generate_comparative_statement_pdf(self, work_data, bidders):
         template = self._load_template('latex_code_for_comparative_statement.TeX')
         variables = self._prepare_common_variables(work_data, min(bidders, key=lambda x: x.get('bid_amount', float('inf'))) if bidders else None, bidders)
-        latex_content = self._render_template(template, variables)
-        html_content = self.convert_latex_to_html(latex_content)
+        html_content = self.render_html(template, variables)
         return self.generate_pdf(html_content)
 
+    @cached_document
     def generate_letter_acceptance_pdf(self, work_data, l1_bidder):
         template = self._load_template('latex_code_for_letter_of_acceptance.tex')
         variables = self._prepare_common_variables(work_data, l1_bidder)
-        latex_content = self._render_template(template, variables)
-        html_content = self.convert_latex_to_html(latex_content)
+        html_content = self.render_html(template, variables)
         return self.generate_pdf(html_content)
 
+    @cached_document
     def generate_work_order_pdf(self, work_data, l1_bidder):
         template = self._load_template('latex_code_for_work_order.TeX')
         variables = self._prepare_common_variables(work_data, l1_bidder)
@@ -138,27 +256,118 @@ class LatexPDFGenerator:
             'START_DATE': self.date_utils.format_display_date(start_date),
             'COMPLETION_DATE': self.date_utils.format_display_date(completion_date)
         })
-        latex_content = self._render_template(template, variables)
-        html_content = self.convert_latex_to_html(latex_content)
+        html_content = self.render_html(template, variables)
         return self.generate_pdf(html_content)
 
+    @cached_document
     def generate_scrutiny_sheet_pdf(self, work_data, bidders):
         template = self._load_template('latex_code_for_scrutiny_sheet.TeX')
-        variables = self._prepare_common_variables(work_data, None, bidders)
-        latex_content = self._render_template(template, variables)
-        html_content = self.convert_latex_to_html(latex_content)
+        # The sheet names the lowest contractor and rate
+        l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf'))) if bidders else None
+        variables = self._prepare_common_variables(work_data, l1_bidder, bidders)
+        html_content = self.render_html(template, variables)
         return self.generate_pdf(html_content)
 
-    def generate_bulk_pdfs(self, work_data, bidders):
+    def _worth_a_pool(self, pending):
+        """Whether the documents still to render are expected to gain from worker processes."""
+        if len(pending) < BULK_PARALLEL_MIN_DOCUMENTS:
+            return False
+        measured = [self._bulk_method_seconds.get(method_name) for method_name, _ in pending.values()]
+        if None in measured:
+            return True
+        return sum(measured) >= BULK_PARALLEL_MIN_SECONDS
+
+    def generate_bulk_pdfs(self, work_data, bidders, parallel=True, max_workers=None):
+        """
+        Generate the comparative statement, letter of acceptance, work order
+        and scrutiny sheet for one work.
+
+        Documents are rendered in a process pool shared by every call (started
+        on first use, stopped at exit) so each pandoc + WeasyPrint run proceeds
+        independently. They are rendered in-process instead when only one
+        worker is available, fewer than BULK_PARALLEL_MIN_DOCUMENTS are not
+        already cached, or their last measured render times add up to less
+        than BULK_PARALLEL_MIN_SECONDS. A document that
+        fails is logged and left out without aborting the others.
+        Per-document timings and errors are kept in self.last_bulk_timings
+        and self.last_bulk_errors.
+
+        Args:
+            work_data: dict with 'work_info'
+            bidders: List of bidder dicts
+            parallel: Render in worker processes; False renders one after another
+            max_workers: Worker process count (defaults to one per document,
+                capped at the CPU count)
+
+        Returns:
+            dict of document name -> PDF bytes for the documents that succeeded
+        """
+        if not work_data or 'work_info' not in work_data:
+            self.logger.error("Invalid work_data: missing or None")
+            raise ValueError("Invalid work_data")
+
+        work_id = work_data['work_info'].get('item_no', '1')
+        l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf'))) if bidders else None
+        jobs = {
+            f'{prefix}_Work_{work_id}': (method_name, bidders if takes == 'bidders' else l1_bidder)
+            for prefix, method_name, takes in BULK_DOCUMENTS
+        }
+
+        started = time.perf_counter()
+        # Documents already in the cache never reach the pool
+        cache = get_document_cache()
+        keys = {
+            name: document_cache_key(self, method_name, work_data, bidder_arg)
+            for name, (method_name, bidder_arg) in jobs.items()
+        }
+        outcomes = {}
+        for name, key in keys.items():
+            pdf = cache.get(key)
+            if pdf is not None:
+                outcomes[name] = (pdf, 0.0, None)
+        pending = {name: job for name, job in jobs.items() if name not in outcomes}
+
+        workers = max_workers or min(len(BULK_DOCUMENTS), os.cpu_count() or 1)
+        if parallel and workers > 1 and self._worth_a_pool(pending):
+            executor = None
+            try:
+                executor = _get_bulk_pool(workers)
+                futures = {
+                    executor.submit(_generate_bulk_document, self.template_dir, method_name, work_data, bidder_arg): name
+                    for name, (method_name, bidder_arg) in pending.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    outcomes[name] = future.result()
+                    if outcomes[name][2] is None:
+                        cache.put(keys[name], outcomes[name][0])
+            except Exception as e:
+                if executor is not None and isinstance(e, BrokenProcessPool):
+                    _discard_bulk_pool(executor)
+                self.logger.warning(f"Process pool unavailable, generating remaining PDFs serially: {str(e)}")
+        for name, (method_name, bidder_arg) in jobs.items():
+            if name not in outcomes:
+                document_started = time.perf_counter()
+                try:
+                    pdf = getattr(self, method_name)(work_data, bidder_arg)
+                    outcomes[name] = (pdf, time.perf_counter() - document_started, None)
+                except Exception as e:
+                    outcomes[name] = (None, time.perf_counter() - document_started, str(e))
+
         documents = {}
-        try:
-            work_id = work_data['work_info']['item_no']
-            l1_bidder = min(bidders, key=lambda x: x.get('bid_amount', float('inf'))) if bidders else None
-            documents[f'Comparative_Statement_Work_{work_id}'] = self.generate_comparative_statement_pdf(work_data, bidders)
-            documents[f'Letter_of_Acceptance_Work_{work_id}'] = self.generate_letter_acceptance_pdf(work_data, l1_bidder)
-            documents[f'Work_Order_Work_{work_id}'] = self.generate_work_order_pdf(work_data, l1_bidder)
-            documents[f'Scrutiny_Sheet_Work_{work_id}'] = self.generate_scrutiny_sheet_pdf(work_data, bidders)
-            return documents
-        except Exception as e:
-            self.logger.error(f"Error generating bulk PDFs: {str(e)}")
-            raise
\ No newline at end of file
+        self.last_bulk_timings = {}
+        self.last_bulk_errors = {}
+        for name, (method_name, _) in jobs.items():
+            pdf, seconds, error = outcomes[name]
+            self.last_bulk_timings[name] = seconds
+            if name in pending and error is None:
+                self._bulk_method_seconds[method_name] = seconds
+            if error is not None:
+                self.logger.error(f"Error generating {name}: {error}")
+                self.last_bulk_errors[name] = error
+            else:
+                self.logger.info(f"Generated {name} in {seconds:.2f}s")
+                documents[name] = pdf
+        self.logger.info(f"Generated {len(documents)}/{len(jobs)} bulk PDFs in "
+                         f"{time.perf_counter() - started:.2f}s")
+        return documents
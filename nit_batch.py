@@ -0,0 +1,123 @@
+"""
+Batch NIT Ingestion for Tender Processing System
+Parses a folder of NIT workbooks in parallel with ExcelParser
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from excel_parser import NIT_FILE_EXTENSIONS
+
+# Column order and dtypes of the merged work table
+WORK_TABLE_DTYPES = {
+    'source_file': 'string',
+    'nit_number': 'string',
+    'nit_date': 'string',
+    'receipt_date': 'string',
+    'opening_date': 'string',
+    'item_no': 'string',
+    'work_name': 'string',
+    'estimated_cost': 'float64',
+    'earnest_money': 'float64',
+    'time_completion': 'string',
+}
+
+
+
+def _parse_nit_file(path: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """Worker: parse one workbook, returning (path, result, error message)."""
+    from excel_parser import ExcelParser
+
+    try:
+        return path, ExcelParser().parse_nit_excel(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _work_rows(path: str, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten one parse result into work-table rows."""
+    return [
+        {
+            'source_file': os.path.basename(path),
+            'nit_number': result.get('nit_number', ''),
+            'nit_date': result.get('nit_date', ''),
+            'receipt_date': result.get('receipt_date', ''),
+            'opening_date': result.get('opening_date', ''),
+            'item_no': work.get('item_no', ''),
+            'work_name': work.get('name', ''),
+            'estimated_cost': work.get('estimated_cost', 0),
+            'earnest_money': work.get('earnest_money', 0),
+            'time_completion': work.get('time_completion', ''),
+        }
+        for work in result.get('works', [])
+    ]
+
+
+def find_nit_files(input_dir: str) -> List[str]:
+    """
+    Return the NIT workbooks in input_dir, sorted by name.
+
+    Accepts the same NIT_FILE_EXTENSIONS as the upload widgets (in any
+    case) and skips Excel lock files.
+    """
+    suffixes = {f'.{extension}' for extension in NIT_FILE_EXTENSIONS}
+    return sorted(
+        str(path) for path in Path(input_dir).iterdir()
+        if path.suffix.lower() in suffixes and path.is_file() and not path.name.startswith('~$')
+    )
+
+
+def parse_nit_folder(input_dir: str, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Parse every NIT workbook in a folder using a process pool.
+
+    Args:
+        input_dir: Folder containing NIT workbooks (see find_nit_files)
+        max_workers: Worker process count (defaults to the CPU count);
+            1 parses in the calling process
+
+    Returns:
+        dict with 'works' (DataFrame of every work row, typed per
+        WORK_TABLE_DTYPES and ordered by file then item), 'errors' (list of
+        {'file', 'error'} dicts for workbooks that failed to parse) and
+        'parsed_files' (number of workbooks parsed successfully)
+    """
+    files = find_nit_files(input_dir)
+    logging.info(f"Batch parsing {len(files)} NIT workbooks from {input_dir}")
+
+    outcomes = []
+    if max_workers == 1 or len(files) <= 1:
+        outcomes = [_parse_nit_file(path) for path in files]
+    else:
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        # Spawned, not forked, so no lock held by another server thread is
+        # copied into the workers
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(_parse_nit_file, path) for path in files]
+            for future in as_completed(futures):
+                outcomes.append(future.result())
+
+    rows = []
+    errors = []
+    for path, result, error in sorted(outcomes, key=lambda outcome: outcome[0]):
+        if error is not None:
+            logging.error(f"Failed to parse NIT workbook {path}: {error}")
+            errors.append({'file': os.path.basename(path), 'error': error})
+        else:
+            rows.extend(_work_rows(path, result))
+
+    works = pd.DataFrame(rows, columns=list(WORK_TABLE_DTYPES)).astype(WORK_TABLE_DTYPES)
+    logging.info(f"Batch parsed {len(works)} works from {len(files) - len(errors)} workbooks, "
+                 f"{len(errors)} failed")
+    return {
+        'works': works,
+        'errors': errors,
+        'parsed_files': len(files) - len(errors),
+    }
@@ -0,0 +1,248 @@
+"""
+Batch Document Generation for Tender Processing System
+Generates the tender documents for every work of a parsed NIT in a
+process pool and streams them into one ZIP archive
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from document_cache import document_cache_key, get_document_cache
+from zip_generator import ZipGenerator
+
+# Archive name prefix and generator method stem of each document
+BATCH_DOCUMENTS = (
+    ('Comparative_Statement', 'generate_comparative_statement'),
+    ('Scrutiny_Sheet', 'generate_scrutiny_sheet'),
+    ('Letter_of_Acceptance', 'generate_letter_of_acceptance'),
+    ('Work_Order', 'generate_work_order'),
+)
+
+# Output format -> (generator class, method suffix, file extension)
+BATCH_FORMATS = {
+    'pdf': ('PDFGenerator', '_pdf', '.pdf'),
+    'docx': ('DocumentGenerator', '_doc', '.docx'),
+}
+
+ProgressCallback = Callable[[int, int, str], None]
+
+_worker_generators: Dict[str, Any] = {}
+
+
+def _generator(class_name: str):
+    """Return this process's instance of a document generator class."""
+    if class_name not in _worker_generators:
+        if class_name == 'PDFGenerator':
+            from pdf_generator import get_pdf_generator
+            _worker_generators[class_name] = get_pdf_generator()
+        else:
+            from document_generator import DocumentGenerator
+            _worker_generators[class_name] = DocumentGenerator()
+    return _worker_generators[class_name]
+
+
+def _render_work(work: Dict[str, Any], bidders: List[Dict[str, Any]],
+                 jobs: List[Tuple[str, str, str]]) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Worker: render one work's documents, returning (arcname, content, error message) per job."""
+    outcomes = []
+    for arcname, class_name, method_name in jobs:
+        try:
+            content = getattr(_generator(class_name), method_name)(work, bidders)
+            outcomes.append((arcname, content, None))
+        except Exception as e:
+            outcomes.append((arcname, None, str(e)))
+    return outcomes
+
+
+def _blank(value: Any) -> bool:
+    """True for None, empty strings and NaN (empty data-editor cells)."""
+    return value is None or value != value or (isinstance(value, str) and not value.strip())
+
+
+def _safe_name(value: Any) -> str:
+    """Make a value usable as one archive path component."""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(value).strip()).strip('_') or 'NA'
+
+
+def work_record(nit: Dict[str, Any], work: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the work dict the document generators expect for one NIT work.
+
+    Args:
+        nit: ExcelParser.parse_nit_excel result
+        work: One entry of nit['works']
+    """
+    estimated_cost = float(str(work.get('estimated_cost', 0) or 0).replace(',', ''))
+    earnest_money = float(str(work.get('earnest_money', 0) or 0).replace(',', ''))
+    return {
+        'work_name': work.get('name', ''),
+        'nit_number': nit.get('nit_number', ''),
+        'item_no': str(work.get('item_no', '')),
+        'work_info': {
+            'estimated_cost': estimated_cost,
+            'earnest_money': earnest_money,
+            'time_of_completion': work.get('time_completion', ''),
+            'date': nit.get('nit_date', '')
+        }
+    }
+
+
+def bidders_by_work(nit: Dict[str, Any], bidder_table: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Turn a per-work bidder table into bidder lists keyed by item number.
+
+    Args:
+        nit: ExcelParser.parse_nit_excel result
+        bidder_table: Rows with 'item_no', 'name', 'percentage' and optionally
+            'address'; bid amounts are calculated from each work's estimated cost
+
+    Returns:
+        dict of item_no -> bidder dicts as used by the document generators
+    """
+    from tender_processor import TenderProcessor
+
+    processor = TenderProcessor()
+    works = {str(work.get('item_no', '')): work_record(nit, work) for work in nit.get('works', [])}
+    grouped: Dict[str, List[Dict[str, Any]]] = {item_no: [] for item_no in works}
+    for row in bidder_table:
+        if any(_blank(row.get(column)) for column in ('item_no', 'name', 'percentage')):
+            continue
+        item_no = str(row['item_no']).strip()
+        name = str(row['name']).strip()
+        if item_no not in works or not name:
+            continue
+        work_info = works[item_no]['work_info']
+        percentage = float(row['percentage'])
+        grouped[item_no].append({
+            'name': name,
+            'address': '' if _blank(row.get('address')) else str(row['address']),
+            'percentage': percentage,
+            'bid_amount': processor.calculate_bid_amount(work_info['estimated_cost'], percentage),
+            'earnest_money': work_info['earnest_money']
+        })
+    return grouped
+
+
+def generate_nit_documents(nit: Dict[str, Any], bidders: Dict[str, List[Dict[str, Any]]],
+                           output: Union[str, BinaryIO], formats: Iterable[str] = ('pdf',),
+                           max_workers: Optional[int] = None,
+                           progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Generate every document for every work of a NIT into one ZIP archive.
+
+    Works are rendered in a process pool and each finished work is written
+    to the archive as soon as it arrives, so only the documents of works in
+    flight are held in memory. Documents already in the document cache are
+    not re-rendered.
+
+    Args:
+        nit: ExcelParser.parse_nit_excel result
+        bidders: item_no -> bidder list (see bidders_by_work); works with no
+            bidders are skipped
+        output: Path or writable binary file for the ZIP archive
+        formats: Any of BATCH_FORMATS
+        max_workers: Worker process count (defaults to the CPU count);
+            1 renders in the calling process
+        progress: Called as progress(done, total, message) after each work
+
+    Returns:
+        dict with 'documents' (number written), 'works' (number of works
+        processed), 'skipped' (item numbers without bidders) and 'errors'
+        (list of {'document', 'error'} dicts)
+    """
+    formats = [fmt for fmt in formats if fmt in BATCH_FORMATS]
+    folder = f"NIT_{_safe_name(nit.get('nit_number', ''))}"
+
+    cache = get_document_cache()
+    tasks = []
+    skipped = []
+    cached: List[Tuple[str, bytes]] = []
+    for work in nit.get('works', []):
+        record = work_record(nit, work)
+        work_bidders = bidders.get(record['item_no']) or []
+        if not work_bidders:
+            skipped.append(record['item_no'])
+            continue
+        jobs = []
+        for prefix, stem in BATCH_DOCUMENTS:
+            for fmt in formats:
+                class_name, suffix, extension = BATCH_FORMATS[fmt]
+                arcname = (f"{folder}/Work_{_safe_name(record['item_no'])}/"
+                           f"{prefix}_Work_{_safe_name(record['item_no'])}{extension}")
+                key = document_cache_key(_generator(class_name), stem + suffix, record, work_bidders)
+                content = cache.get(key)
+                if content is not None:
+                    cached.append((arcname, content))
+                else:
+                    jobs.append((arcname, class_name, stem + suffix))
+        tasks.append((record, work_bidders, jobs))
+
+    total = len(tasks)
+    done = 0
+    errors = []
+    logging.info(f"Batch generating documents for {total} works of NIT {nit.get('nit_number', '')}")
+
+    def report(message: str) -> None:
+        if progress:
+            progress(done, total, message)
+
+    def collect(outcomes: List[Tuple[str, Optional[bytes], Optional[str]]]) -> Iterator[Tuple[str, bytes]]:
+        for arcname, content, error in outcomes:
+            if error is not None:
+                logging.error(f"Failed to generate {arcname}: {error}")
+                errors.append({'document': arcname, 'error': error})
+            else:
+                yield arcname, content
+
+    def entries() -> Iterator[Tuple[str, bytes]]:
+        nonlocal done
+        yield from cached
+
+        pending = [task for task in tasks if task[2]]
+        done = total - len(pending)
+        report(f"{done} works served from cache")
+
+        if max_workers == 1 or len(pending) <= 1:
+            for record, work_bidders, jobs in pending:
+                yield from collect(_render_work(record, work_bidders, jobs))
+                done += 1
+                report(f"Work {record['item_no']} done")
+            return
+
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        # Spawned, not forked, so no lock held by another server thread is
+        # copied into the workers
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(_render_work, record, work_bidders, jobs): (record, work_bidders, jobs)
+                for record, work_bidders, jobs in pending
+            }
+            for future in as_completed(futures):
+                record, work_bidders, jobs = futures[future]
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    outcomes = [(arcname, None, str(e)) for arcname, _, _ in jobs]
+                for (arcname, content, error), (_, class_name, method_name) in zip(outcomes, jobs):
+                    if error is None:
+                        cache.put(document_cache_key(_generator(class_name), method_name, record, work_bidders),
+                                  content)
+                yield from collect(outcomes)
+                done += 1
+                report(f"Work {record['item_no']} done")
+
+    written = ZipGenerator(parallel=True).write_zip(entries(), output)
+
+    logging.info(f"Batch wrote {written} documents for {total} works, "
+                 f"{len(skipped)} skipped, {len(errors)} failed")
+    return {
+        'documents': written,
+        'works': total,
+        'skipped': skipped,
+        'errors': errors,
+    }
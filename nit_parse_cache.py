@@ -0,0 +1,96 @@
+"""
+NIT Parse Cache for Tender Processing System
+Caches parsed NIT workbooks by the SHA-256 of the uploaded bytes
+"""
+
+import copy
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+
+from tiered_cache import SharedInstance, TieredCache
+
+# Bump when the shape of ExcelParser.parse_nit_excel's result changes so that
+# stale on-disk entries are never served.
+PARSER_VERSION = "2"
+
+
+class NITParseCache(TieredCache):
+    """Two-tier (memory LRU + optional disk) cache of parsed NIT results."""
+
+    label = 'NIT cache'
+    file_prefix = 'nit_'
+    file_suffix = '.json'
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Number of parse results kept in memory
+            cache_dir: Directory for the on-disk tier; None disables it
+            max_disk_bytes: Size budget for the on-disk tier
+        """
+        super().__init__(max_entries, cache_dir, max_disk_bytes)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(data: bytes) -> str:
+        """Return the cache key for raw workbook bytes."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        # Older parser versions keep the nit_ prefix so they still count
+        # towards (and are evicted from) the disk budget
+        return os.path.join(self.cache_dir, f"nit_{PARSER_VERSION}_{key}.json")
+
+    def _encode(self, result: Dict[str, Any]) -> bytes:
+        return json.dumps(result, ensure_ascii=False).encode('utf-8')
+
+    def _decode(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data.decode('utf-8'))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, or None."""
+        result = self._lookup(key)
+        return copy.deepcopy(result) if result is not None else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a parse result under key in every enabled tier."""
+        self._store(key, copy.deepcopy(result))
+
+    def get_or_parse(self, data: bytes, parse: Callable[[io.BytesIO], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the parse result for data, calling parse only on a cache miss.
+
+        Args:
+            data: Raw bytes of the uploaded workbook
+            parse: Callable taking a binary file object, e.g. ExcelParser().parse_nit_excel
+
+        Returns:
+            A private copy of the parse result
+        """
+        key = self.make_key(data)
+        result = self.get(key)
+        if result is not None:
+            logging.info(f"NIT parse cache hit for {key[:12]}")
+            return result
+
+        result = parse(io.BytesIO(data))
+        if result:
+            self.put(key, result)
+        return copy.deepcopy(result)
+
+
+_shared_cache = SharedInstance(lambda: NITParseCache(cache_dir=os.getenv('NIT_PARSE_CACHE_DIR') or None))
+
+
+def get_nit_parse_cache() -> NITParseCache:
+    """
+    Return the process-wide cache shared by all Streamlit sessions.
+
+    The disk tier is enabled by setting NIT_PARSE_CACHE_DIR.
+    """
+    return _shared_cache()
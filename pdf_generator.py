@@ -5,48 +5,152 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import copy
 import io
 import logging
 from date_utils import DateUtils
+from asset_cache import get_asset_cache
+from document_cache import cached_document, source_version
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+OFFICE_HEADER_TEXT = "OFFICE OF THE EXECUTIVE ENGINEER PWD ELECTRIC DIVISION UDAIPUR"
+
+COMPARATIVE_SIGNATURE_TEXT = """
+        <br/><br/><br/>
+        Executive Engineer&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        Assistant Engineer&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        Junior Engineer<br/>
+        PWD Electric Division&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        PWD Electric Division&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        PWD Electric Division<br/>
+        Udaipur&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        Udaipur&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
+        Udaipur
+        """
+
+SCRUTINY_SIGNATURE_TEXT = """
+        <br/><br/><br/>
+        <b>Executive Engineer<br/>
+        PWD Electric Division<br/>
+        Udaipur</b>
+        """
+
+# Table layouts never depend on the data, so they are built once at import
+COMPARATIVE_HEADER_ROW = ('S.No.', 'Name of Bidders', '% Above/Below', 'Amount (Rs.)', 'Tendered\nAmount (Rs.)', 'Remarks')
+COMPARATIVE_COL_WIDTHS = (30, 150, 70, 80, 90, 40)
+SCRUTINY_COL_WIDTHS = (20, 120, 180)
+
+_COMPARATIVE_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 2, colors.black),
+    ('BOX', (0, 0), (-1, -1), 3, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+]
+COMPARATIVE_TABLE_STYLE = TableStyle(_COMPARATIVE_TABLE_COMMANDS)
+# With the L1 bidder row (the first after the estimate) highlighted
+COMPARATIVE_L1_TABLE_STYLE = TableStyle(_COMPARATIVE_TABLE_COMMANDS + [
+    ('BACKGROUND', (0, 2), (-1, 2), colors.lightgreen),
+    ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+])
+
+SCRUTINY_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 2, colors.black),
+    ('BOX', (0, 0), (-1, -1), 3, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
 class PDFGenerator:
     """Generates PDF documents for tender processing system."""
     
     def __init__(self):
         self.date_utils = DateUtils()
-        self.styles = getSampleStyleSheet()
+        # The stylesheet never changes, so every generator shares one copy
+        (self.styles, self.title_style, self.header_style,
+         self.body_style) = get_asset_cache().static('pdf_generator_styles', self._build_styles)
+        # Fixed headings and signature blocks are parsed once per process
+        self._flowables = get_asset_cache().static('pdf_generator_flowables', self._build_flowables)
+    
+    def cache_version(self):
+        """Hash of this module's source: the layout is code, so editing it invalidates cached PDFs."""
+        return source_version(__name__)
+    
+    @staticmethod
+    def _build_styles():
+        """Build the sample stylesheet and the custom paragraph styles."""
+        styles = getSampleStyleSheet()
         
         # Custom styles
-        self.title_style = ParagraphStyle(
+        title_style = ParagraphStyle(
             'CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=14,
             spaceAfter=12,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
         )
         
-        self.header_style = ParagraphStyle(
+        header_style = ParagraphStyle(
             'CustomHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=12,
             spaceAfter=10,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
         )
         
-        self.body_style = ParagraphStyle(
+        body_style = ParagraphStyle(
             'CustomBody',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             spaceAfter=6,
             alignment=TA_LEFT,
             fontName='Helvetica'
         )
+        return styles, title_style, header_style, body_style
+    
+    def _build_flowables(self) -> Dict[str, Paragraph]:
+        """Build the Paragraphs whose text never changes."""
+        signature_style = ParagraphStyle('Signature', parent=self.body_style,
+                                         alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold')
+        return {
+            'office_header': Paragraph(OFFICE_HEADER_TEXT, self.header_style),
+            'comparative_title': Paragraph("<u>COMPARATIVE STATEMENT OF TENDER</u>", self.title_style),
+            'scrutiny_title': Paragraph("<u>Scrutiny Sheet of Tender</u>", self.title_style),
+            'letter_of_acceptance_title': Paragraph("<u>LETTER OF ACCEPTANCE</u>", self.title_style),
+            'work_order_title': Paragraph("<u>WORK ORDER</u>", self.title_style),
+            'comparative_signature': Paragraph(COMPARATIVE_SIGNATURE_TEXT, self.body_style),
+            'scrutiny_signature': Paragraph(SCRUTINY_SIGNATURE_TEXT, signature_style),
+        }
     
+    def _flowable(self, name: str) -> Paragraph:
+        """
+        Return a fixed Paragraph for one document.
+        
+        A shallow copy shares the parsed text but keeps the layout state of
+        each build separate, so concurrent builds never interfere.
+        """
+        return copy.copy(self._flowables[name])
+    
+    @cached_document
     def generate_comparative_statement_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate comparative statement in PDF format."""
         
@@ -74,13 +178,11 @@ class PDFGenerator:
         elements = []
         
         # Office header
-        office_header = Paragraph("OFFICE OF THE EXECUTIVE ENGINEER PWD ELECTRIC DIVISION UDAIPUR", self.header_style)
-        elements.append(office_header)
+        elements.append(self._flowable('office_header'))
         elements.append(Spacer(1, 12))
         
         # Title
-        title = Paragraph("<u>COMPARATIVE STATEMENT OF TENDER</u>", self.title_style)
-        elements.append(title)
+        elements.append(self._flowable('comparative_title'))
         elements.append(Spacer(1, 12))
         
         # Work details
@@ -97,7 +199,7 @@ class PDFGenerator:
         
         # Table data
         table_data = [
-            ['S.No.', 'Name of Bidders', '% Above/Below', 'Amount (Rs.)', 'Tendered\nAmount (Rs.)', 'Remarks'],
+            list(COMPARATIVE_HEADER_ROW),
             ['E', 'ESTIMATED COST', '-', f'{estimated_cost:,.0f}', f'{estimated_cost:,.0f}', '-']
         ]
         
@@ -113,49 +215,14 @@ class PDFGenerator:
             ]
             table_data.append(row)
         
-        # Create table with adjusted column widths
-        table = Table(table_data, colWidths=[30, 150, 70, 80, 90, 40])
-        
-        # Table style with borders
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 2, colors.black),
-            ('BOX', (0, 0), (-1, -1), 3, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ])
-        
-        # Highlight L1 bidder row
-        if len(sorted_bidders) > 0:
-            table_style.add('BACKGROUND', (0, 2), (-1, 2), colors.lightgreen)
-            table_style.add('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold')
-        
-        table.setStyle(table_style)
+        # Create table with adjusted column widths and borders, highlighting the L1 bidder row
+        table = Table(table_data, colWidths=list(COMPARATIVE_COL_WIDTHS))
+        table.setStyle(COMPARATIVE_L1_TABLE_STYLE if sorted_bidders else COMPARATIVE_TABLE_STYLE)
         elements.append(table)
         elements.append(Spacer(1, 20))
         
         # Signature section
-        signature_text = """
-        <br/><br/><br/>
-        Executive Engineer&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        Assistant Engineer&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        Junior Engineer<br/>
-        PWD Electric Division&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        PWD Electric Division&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        PWD Electric Division<br/>
-        Udaipur&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        Udaipur&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;
-        Udaipur
-        """
-        signature_para = Paragraph(signature_text, self.body_style)
-        elements.append(signature_para)
+        elements.append(self._flowable('comparative_signature'))
         
         # Build PDF
         doc.build(elements)
@@ -164,6 +231,7 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @cached_document
     def generate_scrutiny_sheet_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate scrutiny sheet in PDF format."""
         
@@ -190,8 +258,7 @@ class PDFGenerator:
         elements = []
         
         # Title
-        title = Paragraph("<u>Scrutiny Sheet of Tender</u>", self.title_style)
-        elements.append(title)
+        elements.append(self._flowable('scrutiny_title'))
         elements.append(Spacer(1, 20))
         
         # Table data
@@ -213,40 +280,14 @@ class PDFGenerator:
             ['15', 'Recommendation', 'The tender may be accepted as per rules.']
         ]
         
-        # Create table
-        table = Table(table_data, colWidths=[20, 120, 180])
-        
-        # Table style with borders
-        table_style = TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 2, colors.black),
-            ('BOX', (0, 0), (-1, -1), 3, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-        
-        table.setStyle(table_style)
+        # Create table with borders
+        table = Table(table_data, colWidths=list(SCRUTINY_COL_WIDTHS))
+        table.setStyle(SCRUTINY_TABLE_STYLE)
         elements.append(table)
         elements.append(Spacer(1, 30))
         
         # Signature section
-        signature_text = """
-        <br/><br/><br/>
-        <b>Executive Engineer<br/>
-        PWD Electric Division<br/>
-        Udaipur</b>
-        """
-        signature_para = Paragraph(signature_text, 
-                                 ParagraphStyle('Signature', parent=self.body_style, 
-                                              alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold'))
-        elements.append(signature_para)
+        elements.append(self._flowable('scrutiny_signature'))
         
         # Build PDF
         doc.build(elements)
@@ -255,6 +296,7 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @cached_document
     def generate_letter_of_acceptance_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Letter of Acceptance in PDF format."""
         
@@ -285,13 +327,11 @@ class PDFGenerator:
         elements = []
         
         # Office header
-        office_header = Paragraph("OFFICE OF THE EXECUTIVE ENGINEER PWD ELECTRIC DIVISION UDAIPUR", self.header_style)
-        elements.append(office_header)
+        elements.append(self._flowable('office_header'))
         elements.append(Spacer(1, 20))
         
         # Title (centered)
-        title = Paragraph("<u>LETTER OF ACCEPTANCE</u>", self.title_style)
-        elements.append(title)
+        elements.append(self._flowable('letter_of_acceptance_title'))
         elements.append(Spacer(1, 20))
         
         # Letter content
@@ -336,6 +376,7 @@ class PDFGenerator:
         buffer.close()
         return pdf_data
     
+    @cached_document
     def generate_work_order_pdf(self, work: Dict[str, Any], bidders: List[Dict[str, Any]]) -> bytes:
         """Generate Work Order in PDF format."""
         
@@ -367,13 +408,11 @@ class PDFGenerator:
         elements = []
         
         # Office header
-        office_header = Paragraph("OFFICE OF THE EXECUTIVE ENGINEER PWD ELECTRIC DIVISION UDAIPUR", self.header_style)
-        elements.append(office_header)
+        elements.append(self._flowable('office_header'))
         elements.append(Spacer(1, 20))
         
         # Title (centered)
-        title = Paragraph("<u>WORK ORDER</u>", self.title_style)
-        elements.append(title)
+        elements.append(self._flowable('work_order_title'))
         elements.append(Spacer(1, 20))
         
         # Work order content
@@ -425,3 +464,14 @@ class PDFGenerator:
         pdf_data = buffer.getvalue()
         buffer.close()
         return pdf_data
+
+
+_default_generator: Optional[PDFGenerator] = None
+
+
+def get_pdf_generator() -> PDFGenerator:
+    """Return the process-wide PDFGenerator; it keeps no per-document state, so every session can share it."""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = PDFGenerator()
+    return _default_generator
@@ -1,24 +1,32 @@
 """
-Streamlit front-end for the tender extractor.
+Streamlit front-end for batch NIT ingestion.
 """
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-# NOTE: CLI engine not available in this repository. Provide a minimal stub.
-def process_folder(input_dir: str, output_dir: str) -> None:
-    """Temporary stub: create an empty Excel summary to keep UI working."""
-    import pandas as _pd
+from excel_parser import NIT_FILE_EXTENSIONS
+from nit_batch import find_nit_files, parse_nit_folder
+
+
+def process_folder(input_dir: str, output_dir: str) -> dict:
+    """Parse every NIT workbook in input_dir and write Tender_Summary.xlsx to output_dir."""
+    result = parse_nit_folder(input_dir)
     output_path = Path(output_dir) / "Tender_Summary.xlsx"
-    _pd.DataFrame([]).to_excel(output_path, index=False)
+    with pd.ExcelWriter(output_path) as writer:
+        result['works'].to_excel(writer, sheet_name="Works", index=False)
+        pd.DataFrame(result['errors'], columns=['file', 'error']).to_excel(
+            writer, sheet_name="Errors", index=False
+        )
+    return result
 
 st.set_page_config(page_title="Tender Extractor", page_icon="📄")
 
-st.title("📄 Tender PDF Extractor")
-st.write("Upload one or more tender PDFs and get an instant Excel summary.")
+st.title("📄 NIT Batch Extractor")
+st.write("Upload one or more NIT Excel workbooks and get a combined Excel summary of all works.")
 
 uploaded_files = st.file_uploader(
-    "Choose PDF files",
-    type="pdf",
+    "Choose NIT Excel files",
+    type=list(NIT_FILE_EXTENSIONS),
     accept_multiple_files=True
 )
 
@@ -29,13 +37,17 @@ if st.button("Process") and uploaded_files:
         tmp_out = Path("tmp_output")
         tmp_in.mkdir(exist_ok=True)
         tmp_out.mkdir(exist_ok=True)
+        for stale in find_nit_files(str(tmp_in)):
+            Path(stale).unlink()
 
         # Save uploads
         for f in uploaded_files:
             (tmp_in / f.name).write_bytes(f.getbuffer())
 
-        # Reuse CLI engine
-        process_folder(str(tmp_in), str(tmp_out))
+        # Parse all workbooks in parallel
+        result = process_folder(str(tmp_in), str(tmp_out))
+        for failure in result['errors']:
+            st.warning(f"⚠️ {failure['file']}: {failure['error']}")
 
         # Show result
         excel_path = tmp_out / "Tender_Summary.xlsx"
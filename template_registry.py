@@ -0,0 +1,168 @@
+"""
+Template Registry for Tender Processing System
+Loads the LaTeX templates once, precompiled into literal segments and
+placeholder slots, and validates their environments at load time;
+a template is reloaded when its file changes
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from asset_cache import get_asset_cache
+
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'latex_templates')
+TEMPLATE_EXTENSIONS = ('.tex', '.TeX')
+
+# {KEY} placeholders are upper-case, so LaTeX groups such as {center} are left alone
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+_ENVIRONMENT_PATTERN = re.compile(r"\\(begin|end)\{([^}]+)\}")
+
+# Templates compiled from text that was not loaded through the registry
+MAX_TEXT_TEMPLATES = 64
+
+
+def check_environments(text: str) -> List[str]:
+    """Return a description of each unbalanced \\begin/\\end pair in text (empty if balanced)."""
+    problems = []
+    stack = []
+    for match in _ENVIRONMENT_PATTERN.finditer(text):
+        kind, environment = match.groups()
+        if kind == 'begin':
+            stack.append(environment)
+        elif stack and stack[-1] == environment:
+            stack.pop()
+        else:
+            expected = f"\\end{{{stack[-1]}}}" if stack else "no \\end"
+            problems.append(f"\\end{{{environment}}} where {expected} was expected")
+            if environment in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(environment):]
+    problems.extend(f"\\begin{{{environment}}} is never closed" for environment in stack)
+    return problems
+
+
+class CompiledTemplate:
+    """A template split once into (literal, placeholder) segments."""
+
+    def __init__(self, text: str, name: str = ''):
+        """
+        Args:
+            text: Template text with {KEY} placeholders
+            name: Template file name, used in log messages
+        """
+        self.text = text
+        self.name = name
+        segments: List[Tuple[str, Optional[str]]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            segments.append((text[position:match.start()], match.group(1)))
+            position = match.end()
+        segments.append((text[position:], None))
+        self.segments = tuple(segments)
+        self.placeholders: FrozenSet[str] = frozenset(key for _, key in segments if key)
+        self.problems = check_environments(text)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        Fill the placeholders in one pass.
+
+        Placeholders without a value are left as {KEY}.
+        """
+        parts = []
+        for literal, key in self.segments:
+            parts.append(literal)
+            if key is not None:
+                parts.append(str(values[key]) if key in values else f"{{{key}}}")
+        return ''.join(parts)
+
+    def missing(self, values: Mapping[str, Any]) -> FrozenSet[str]:
+        """Placeholders the template uses that values does not provide."""
+        return frozenset(key for key in self.placeholders if key not in values)
+
+
+class TemplateRegistry:
+    """Every template in one directory, compiled once per version of each file."""
+
+    def __init__(self, template_dir: str = DEFAULT_TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._by_text: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.load_all()
+
+    def _compile(self, text: str, name: str) -> CompiledTemplate:
+        template = CompiledTemplate(text, name)
+        for problem in template.problems:
+            logging.warning(f"Template {name or '<text>'}: {problem}")
+        return template
+
+    def load_all(self) -> None:
+        """Load and validate every template file in the directory."""
+        if not os.path.isdir(self.template_dir):
+            logging.warning(f"Template directory not found: {self.template_dir}")
+            return
+        for file_name in sorted(os.listdir(self.template_dir)):
+            if file_name.endswith(TEMPLATE_EXTENSIONS):
+                try:
+                    self.get(file_name)
+                except Exception as e:
+                    logging.error(f"Error loading template {file_name}: {e}")
+        logging.info(f"Loaded {len(self._templates)} templates from {self.template_dir}")
+
+    def get(self, file_name: str) -> CompiledTemplate:
+        """
+        Return the compiled template for a file in the template directory.
+
+        The file is stat'ed on every call and recompiled only after it changes,
+        so edits show up without restarting the app.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = os.path.join(self.template_dir, file_name)
+        template = get_asset_cache().load(
+            path, lambda text: self._compile(text, file_name), parser_key=CompiledTemplate
+        )
+        with self._lock:
+            previous = self._templates.get(file_name)
+            if previous is not template:
+                if previous is not None:
+                    self._by_text.pop(previous.text, None)
+                self._templates[file_name] = template
+                self._by_text[template.text] = template
+        return template
+
+    def compile(self, text: str) -> CompiledTemplate:
+        """Return the compiled form of template text, reusing loaded templates."""
+        with self._lock:
+            template = self._by_text.get(text)
+            if template is not None:
+                self._by_text.move_to_end(text)
+                return template
+        template = self._compile(text, '')
+        with self._lock:
+            self._by_text[text] = template
+            while len(self._by_text) > MAX_TEXT_TEMPLATES + len(self._templates):
+                self._by_text.popitem(last=False)
+        return template
+
+    def names(self) -> List[str]:
+        """File names of the loaded templates."""
+        with self._lock:
+            return sorted(self._templates)
+
+
+_registries: Dict[str, TemplateRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_template_registry(template_dir: str = DEFAULT_TEMPLATE_DIR) -> TemplateRegistry:
+    """Return the process-wide registry for template_dir, loading it on first use."""
+    key = os.path.abspath(str(template_dir))
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = TemplateRegistry(key)
+        return _registries[key]
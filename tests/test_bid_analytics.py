@@ -0,0 +1,72 @@
+"""
+Tests for BidAnalytics L1 (lowest bid) selection
+"""
+
+import pandas as pd
+
+from bid_analytics import BidAnalytics
+
+
+def _bid(name, amount, work_item="1", nit_number="NIT-01", **extra):
+    bid = {'name': name, 'bid_amount': amount, 'percentage': 0.0, 'work_item': work_item,
+           'work_name': "Road repair", 'estimated_cost': 100000.0, 'date_added': "01-04-24"}
+    if nit_number is not None:
+        bid['nit_number'] = nit_number
+    bid.update(extra)
+    return bid
+
+
+def test_lowest_bid_in_each_tender_wins():
+    analytics = BidAnalytics([
+        _bid("Alpha", 95000), _bid("Beta", 97000),
+        _bid("Alpha", 88000, work_item="2"), _bid("Beta", 86000, work_item="2"),
+    ])
+
+    assert analytics.bidder_profile("Alpha")['wins'] == 1
+    assert analytics.bidder_profile("Beta")['wins'] == 1
+    assert analytics.bidder_profile("alpha ")['win_rate'] == 0.5
+
+
+def test_same_work_in_different_nits_is_not_merged():
+    # Identical work content under two NITs must be two tenders, not one
+    analytics = BidAnalytics([
+        _bid("Alpha", 95000, nit_number="NIT-01"), _bid("Beta", 90000, nit_number="NIT-01"),
+        _bid("Alpha", 95000, nit_number="NIT-02"), _bid("Gamma", 99000, nit_number="NIT-02"),
+    ])
+
+    assert analytics.bidder_profile("Alpha")['wins'] == 1
+    assert analytics.bidder_profile("Beta")['wins'] == 1
+    assert analytics.bidder_profile("Gamma")['wins'] == 0
+
+
+def test_tender_id_takes_precedence_over_nit_number():
+    analytics = BidAnalytics([
+        _bid("Alpha", 95000, tender_id="T-1"), _bid("Beta", 90000, tender_id="T-2"),
+    ])
+
+    assert analytics.bidder_profile("Alpha")['wins'] == 1
+    assert analytics.bidder_profile("Beta")['wins'] == 1
+
+
+def test_bids_without_tender_identity_have_no_outcome():
+    analytics = BidAnalytics([
+        _bid("Alpha", 95000, nit_number=None), _bid("Beta", 90000, nit_number=None),
+        _bid("Alpha", 80000), _bid("Beta", 85000),
+    ])
+
+    alpha = analytics.bidder_profile("Alpha")
+    assert alpha['bids'] == 2
+    assert alpha['decided_bids'] == 1
+    assert alpha['wins'] == 1
+    assert alpha['win_rate'] == 1.0
+    assert analytics.bidder_profile("Beta")['wins'] == 0
+
+    quoted = analytics.quoted_percentages("Beta")
+    assert quoted['won'].isna().sum() == 1
+
+
+def test_bidder_with_only_undecided_bids_has_no_win_rate():
+    analytics = BidAnalytics([_bid("Alpha", 95000, nit_number=None)])
+
+    assert analytics.bidder_profile("Alpha")['wins'] == 0
+    assert pd.isna(analytics.bidder_profile("Alpha")['win_rate'])
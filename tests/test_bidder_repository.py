@@ -0,0 +1,116 @@
+"""
+Tests for BidderRepository and BidderManager on top of it
+"""
+
+import json
+import warnings
+
+import pytest
+
+import database_manager
+from bidder_manager import BidderManager
+from bidder_repository import BidderRepository
+
+
+def _write_json(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def test_legacy_bid_records_are_imported_with_usage_dates(tmp_path):
+    legacy = _write_json(tmp_path / "bidder_database.json", {
+        'bidders': [
+            {'id': 'a1', 'name': "Old Co", 'address': "1 Old St", 'percentage': -2.0,
+             'date_added': "01-01-20", 'last_updated': "05-01-20"},
+            {'id': 'b1', 'name': "Recent Co", 'address': "2 New St", 'percentage': 1.0,
+             'date_added': "01-03-24", 'last_updated': "10-03-24"},
+        ],
+        'statistics': {'total_bidders': 2},
+    })
+    repository = BidderRepository(str(tmp_path / "store.db"), legacy)
+
+    assert [bid['id'] for bid in repository.get_bids()] == ['a1', 'b1']
+    old = repository.get_directory_entry("Old Co")
+    assert old['address'] == "1 Old St"
+    assert old['last_used'] == "2020-01-05 00:00:00"
+    assert old['created_at'] == "2020-01-01 00:00:00"
+    recent = [b['name'] for b in repository.db.get_recent_bidders()]
+    assert recent == ["Recent Co", "Old Co"]
+
+
+def test_legacy_directory_is_imported_once(tmp_path):
+    legacy_path = tmp_path / "bidder_database.json"
+    legacy = _write_json(legacy_path, {
+        "Alpha Works": {'address': "A", 'last_used': "02-02-23"},
+        "Beta Works": {'address': "B", 'last_used': "03-03-24"},
+    })
+    db_path = str(tmp_path / "store.db")
+    repository = BidderRepository(db_path, legacy)
+    assert [b['name'] for b in repository.db.get_recent_bidders()] == ["Beta Works", "Alpha Works"]
+    assert repository.get_directory_entry("Alpha Works")['last_used'] == "2023-02-02 00:00:00"
+
+    _write_json(legacy_path, {"Gamma Works": {'address': "C"}})
+    repository = BidderRepository(db_path, legacy)
+    assert "Gamma Works" not in repository.get_directory()
+
+
+def test_missing_store_meta_does_not_break_startup(tmp_path, monkeypatch):
+    migrations = [
+        (feature, script.replace('CREATE TABLE IF NOT EXISTS store_meta', 'CREATE TABLE IF NOT EXISTS unused_meta'))
+        for feature, script in database_manager.SCHEMA_MIGRATIONS
+    ]
+    monkeypatch.setattr(database_manager, 'SCHEMA_MIGRATIONS', migrations)
+    legacy = _write_json(tmp_path / "bidder_database.json", {"Alpha Works": {'address': "A"}})
+
+    repository = BidderRepository(str(tmp_path / "store.db"), legacy)
+    assert repository.get_bids() == []
+
+
+def test_writes_invalidate_cached_reads(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    repository = BidderRepository(db_path, None)
+    generation = repository.generation
+    options = repository.get_bidder_options()
+    assert options == ("",)
+
+    assert repository.save_directory_entry("Kumar & Sons", address="Udaipur")
+    assert repository.generation > generation
+    assert repository.get_bidder_options() == ("", "Kumar & Sons")
+
+    # A write through another store on the same file is picked up from disk
+    other = BidderRepository(db_path, None)
+    other.put_bid({'id': 'x1', 'name': "Zenith Infra", 'address': "Jaipur"})
+    assert [bid['id'] for bid in repository.get_bids()] == ['x1']
+    assert "Zenith Infra" in repository.get_directory()
+
+
+def test_bidder_manager_accepts_legacy_database_file(tmp_path):
+    legacy = _write_json(tmp_path / "bidders.json", {
+        'bidders': [{'id': 'a1', 'name': "Old Co", 'bid_amount': 1.0, 'percentage': 0.0}],
+    })
+    with pytest.warns(DeprecationWarning):
+        manager = BidderManager(legacy)
+    assert [bid['id'] for bid in manager.get_all_bidders()] == ['a1']
+    assert manager.repository.db.db_path == str(tmp_path / "bidders.db")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        assert BidderManager(database_file=legacy).repository is manager.repository
+
+
+def test_bidder_manager_rejects_other_repository_types():
+    with pytest.raises(TypeError):
+        BidderManager(repository=42)
+
+
+def test_suggestions_are_prefix_matches_only(tmp_path):
+    manager = BidderManager(BidderRepository(str(tmp_path / "store.db"), None))
+    for name in ("Sharma Traders", "sharma construction", "Anil Sharma", "Shah Infra"):
+        assert manager.add_bidder(name, 95000, -5.0, "Udaipur", 2000, "1", "Road", 100000)[0]
+
+    assert manager.get_bidder_suggestions("SHARMA") == ["sharma construction", "Sharma Traders"]
+    assert manager.get_bidder_suggestions("sha", limit=2) == ["Shah Infra", "sharma construction"]
+    assert manager.get_bidder_suggestions("infra") == []
+    # Names containing the text elsewhere come from search_bidders instead
+    assert {b['name'] for b in manager.search_bidders("sharma")} == {
+        "Sharma Traders", "sharma construction", "Anil Sharma"}
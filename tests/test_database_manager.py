@@ -0,0 +1,105 @@
+"""
+Tests for DatabaseManager
+"""
+
+import threading
+
+import database_manager
+from database_manager import DatabaseManager
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+
+    def rerun():
+        db.get_recent_bidders()
+
+    for _ in range(20):
+        thread = threading.Thread(target=rerun)
+        thread.start()
+        thread.join()
+
+    db.get_recent_bidders()
+    assert db.open_connections == 1
+    db.close_all()
+    assert db.open_connections == 0
+
+
+def test_connection_is_reused_within_a_thread(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+    assert db.get_connection() is db.get_connection()
+    db.close()
+    assert db.open_connections == 0
+
+
+def _schema(db):
+    rows = db.get_connection().execute("SELECT name FROM sqlite_master").fetchall()
+    return {row[0] for row in rows}
+
+
+def test_migrations_reach_latest_version(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+    conn = db.get_connection()
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == len(database_manager.SCHEMA_MIGRATIONS)
+    assert {'idx_bidders_name_key', 'bids', 'store_meta'} <= _schema(db)
+    assert db.upsert_enabled
+
+
+def test_migrations_continue_without_fts5(tmp_path, monkeypatch):
+    monkeypatch.setitem(database_manager.MIGRATION_FEATURES, 'fts5', lambda conn: False)
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+
+    schema = _schema(db)
+    assert 'bidders_fts' not in schema
+    assert {'idx_bidders_name_key', 'bids', 'store_meta'} <= schema
+    assert not db.fts_enabled
+    assert db.get_connection().execute('PRAGMA user_version').fetchone()[0] == \
+        len(database_manager.SCHEMA_MIGRATIONS)
+
+    assert db.store_bidder("Sharma Construction", "98290")
+    assert db.store_bidder("  sharma construction ")
+    assert [b['name'] for b in db.search_bidders("sharma")] == ["Sharma Construction"]
+
+
+def test_store_bidder_upserts_on_normalised_name(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+    assert db.store_bidder("Gupta Electricals", "111")
+    assert db.store_bidder(" GUPTA electricals ")
+    assert db.store_bidder("Gupta Electricals", "222")
+    assert not db.store_bidder("   ")
+
+    bidders = db.get_recent_bidders()
+    assert len(bidders) == 1
+    assert bidders[0]['name'] == "Gupta Electricals"
+    assert bidders[0]['contact'] == "222"
+
+
+def test_bulk_store_bidders_dedupes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "bidders.db"))
+    written = db.bulk_store_bidders([
+        {'name': "A One Traders", 'contact': "1"},
+        {'name': "a one traders"},
+        {'name': ""},
+        {'name': "B Two Works"},
+    ])
+    assert written == 3
+    assert sorted(b['name'] for b in db.get_recent_bidders()) == ["A One Traders", "B Two Works"]
+    assert db.get_bidder_by_name("A ONE TRADERS")['contact'] == "1"
+
+
+def test_store_bidder_without_unique_index(tmp_path):
+    path = str(tmp_path / "bidders.db")
+    db = DatabaseManager(path)
+    with db.get_connection() as conn:
+        conn.execute('DROP INDEX idx_bidders_name_key')
+    db.close_all()
+
+    db = DatabaseManager(path)
+    assert not db.upsert_enabled
+    assert db.store_bidder("Mehta Builders", "1")
+    assert db.store_bidder("mehta builders", "2")
+    assert db.bulk_store_bidders([{'name': "MEHTA BUILDERS"}, {'name': "Other"}]) == 2
+
+    bidders = db.get_recent_bidders()
+    assert sorted(b['name'] for b in bidders) == ["Mehta Builders", "Other"]
+    assert db.get_bidder_by_name("Mehta Builders")['contact'] == "2"
@@ -0,0 +1,137 @@
+"""
+Tests for DocumentCache key stability and the cached_document decorator
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+import document_cache
+from document_cache import DocumentCache, cached_document, document_cache_key
+
+WORK = {'work_info': {'item_no': '1', 'estimated_cost': 100000}}
+BIDDERS = [{'name': "Alpha", 'bid_amount': 95000}]
+
+
+class _FixedDate(datetime.date):
+    today_value = (2024, 4, 1)
+
+    @classmethod
+    def today(cls):
+        return cls(*cls.today_value)
+
+
+@pytest.fixture
+def fixed_date(monkeypatch):
+    monkeypatch.setattr(document_cache, 'date', _FixedDate)
+    monkeypatch.setattr(_FixedDate, 'today_value', (2024, 4, 1))
+    return _FixedDate
+
+
+def _key(*inputs, document='PDFGenerator.generate_work_order_pdf', version='v1'):
+    return DocumentCache.make_key(document, version, *inputs)
+
+
+def test_key_is_pinned_across_processes(fixed_date):
+    # A change here silently invalidates every on-disk cache entry; bump
+    # DOCUMENT_CACHE_VERSION instead of updating this value
+    assert _key(WORK, BIDDERS) == "fd5b22e712b6446808344d6bc5b725edea1c752d5021cbbd163dd5c076b86ba5"
+
+
+def test_key_ignores_mapping_order_and_sequence_type(fixed_date):
+    reordered = {'work_info': {'estimated_cost': 100000, 'item_no': '1'}}
+    assert _key(reordered, tuple(BIDDERS)) == _key(WORK, BIDDERS)
+
+
+@pytest.mark.parametrize('amount', [95000, 95000.0, np.int64(95000), np.float64(95000)])
+def test_key_normalises_numbers(fixed_date, amount):
+    assert _key(WORK, [{'name': "Alpha", 'bid_amount': amount}]) == _key(WORK, BIDDERS)
+
+
+@pytest.mark.parametrize('change', [
+    lambda: _key(WORK, [{'name': "Alpha", 'bid_amount': 95001}]),
+    lambda: _key(WORK, [{'name': "Beta", 'bid_amount': 95000}]),
+    lambda: _key(WORK, BIDDERS, document='PDFGenerator.generate_scrutiny_sheet_pdf'),
+    lambda: _key(WORK, BIDDERS, version='v2'),
+    lambda: _key(WORK),
+])
+def test_key_changes_with_any_input(fixed_date, change):
+    assert change() != _key(WORK, BIDDERS)
+
+
+def test_key_changes_with_the_date(fixed_date):
+    before = _key(WORK, BIDDERS)
+    fixed_date.today_value = (2024, 4, 2)
+    assert _key(WORK, BIDDERS) != before
+
+
+def test_key_changes_with_the_cache_version(fixed_date, monkeypatch):
+    before = _key(WORK, BIDDERS)
+    monkeypatch.setattr(document_cache, 'DOCUMENT_CACHE_VERSION', "test")
+    assert _key(WORK, BIDDERS) != before
+
+
+class _Generator:
+    def __init__(self, version="t1"):
+        self.version = version
+        self.renders = 0
+
+    def cache_version(self):
+        return self.version
+
+    @cached_document
+    def generate_pdf(self, work, bidders):
+        self.renders += 1
+        return b"%PDF " + str(self.renders).encode()
+
+
+def test_cached_document_renders_once_per_key(tmp_path, monkeypatch):
+    cache = DocumentCache(cache_dir=str(tmp_path))
+    monkeypatch.setattr(document_cache, 'get_document_cache', lambda: cache)
+    generator = _Generator()
+
+    first = generator.generate_pdf(WORK, BIDDERS)
+    assert generator.generate_pdf({'work_info': dict(reversed(WORK['work_info'].items()))}, BIDDERS) == first
+    assert generator.renders == 1
+
+    # A new template version renders again
+    generator.version = "t2"
+    assert generator.generate_pdf(WORK, BIDDERS) != first
+    assert generator.renders == 2
+
+
+def test_disk_tier_survives_a_new_cache_instance(tmp_path):
+    key = document_cache_key(_Generator(), 'generate_pdf', WORK, BIDDERS)
+    DocumentCache(cache_dir=str(tmp_path)).put(key, b"%PDF stored")
+
+    assert DocumentCache(cache_dir=str(tmp_path)).get(key) == b"%PDF stored"
+
+
+def test_source_version_follows_module_edits(tmp_path, monkeypatch):
+    import importlib
+    import os
+    import sys
+
+    module = tmp_path / "layout_module.py"
+    module.write_text("WIDTH = 1\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'layout_module', raising=False)
+    importlib.import_module('layout_module')
+    before = document_cache.source_version('layout_module')
+
+    module.write_text("WIDTH = 22\n", encoding='utf-8')
+    os.utime(module, ns=(1, 1))
+    assert document_cache.source_version('layout_module') != before
+
+
+@pytest.mark.parametrize('module_name, class_name', [
+    ('pdf_generator', 'PDFGenerator'),
+    ('document_generator', 'DocumentGenerator'),
+])
+def test_code_layout_generators_have_a_cache_version(module_name, class_name):
+    import importlib
+
+    generator = getattr(importlib.import_module(module_name), class_name)()
+    assert generator.cache_version() == document_cache.source_version(module_name)
+    assert len(generator.cache_version()) == 64
@@ -0,0 +1,59 @@
+"""
+Tests for ExcelParser against the output of the original row-by-row parser
+"""
+
+import json
+import os
+
+import pytest
+
+from excel_parser import ExcelParser
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_files')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'nit_parse_baseline.json')
+
+with open(BASELINE, 'r', encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.mark.parametrize('file_name', sorted(EXPECTED))
+def test_parse_nit_excel_matches_baseline(file_name):
+    result = ExcelParser().parse_nit_excel(os.path.join(TEST_FILES, file_name))
+    assert json.loads(json.dumps(result, default=str)) == EXPECTED[file_name]
+
+
+def test_import_does_not_create_log_file(tmp_path, monkeypatch):
+    import importlib
+    import excel_parser
+
+    monkeypatch.chdir(tmp_path)
+    importlib.reload(excel_parser)
+    assert not os.path.exists(tmp_path / 'excel_parser.log')
+
+
+def test_blank_metadata_cells_fall_back_to_unknown(tmp_path):
+    from openpyxl import load_workbook
+
+    source = os.path.join(TEST_FILES, 'NIT_1 work.xlsx')
+    # data_only keeps the computed amounts; openpyxl drops cached formula results on save
+    workbook = load_workbook(source, data_only=True)
+    for row in range(1, 5):
+        workbook.worksheets[0].cell(row=row, column=3).value = None
+    blanked = tmp_path / 'blank_metadata.xlsx'
+    workbook.save(blanked)
+
+    result = ExcelParser().parse_nit_excel(str(blanked))
+    expected = ExcelParser().parse_nit_excel(source)
+
+    assert [result[key] for key in ('nit_number', 'nit_date', 'receipt_date', 'opening_date')] == ['Unknown'] * 4
+    assert result['works'] == expected['works']
+    assert len(result['works']) > 0
+
+def test_sheet_without_values_is_empty(tmp_path):
+    from openpyxl import Workbook
+
+    path = tmp_path / 'empty.xlsx'
+    Workbook().save(path)
+
+    with pytest.raises(ValueError, match="empty"):
+        ExcelParser().parse_nit_excel(str(path))
@@ -0,0 +1,48 @@
+"""
+Tests for the trigram name index
+"""
+
+from fuzzy_index import TrigramIndex, normalize_name
+
+
+def _index(names):
+    index = TrigramIndex()
+    for key, name in enumerate(names, start=1):
+        index.add(key, name)
+    return index
+
+
+def test_normalize_name_drops_prefix_and_punctuation():
+    assert normalize_name("M/s. Sharma  Construction, Co.") == "sharma construction co"
+    assert normalize_name("Shri Ram Builders") == "ram builders"
+
+
+def test_search_tolerates_typos_and_ranks_best_first():
+    index = _index(["Sharma Construction", "Verma Electricals", "Sharma Traders"])
+    matches = index.search("Sharama Constrction")
+    assert matches[0][0] == 1
+    assert all(score >= 0.3 for _, score in matches)
+    assert [key for key, _ in matches] == sorted((key for key, _ in matches),
+                                                  key=lambda key: -dict(matches)[key])
+
+
+def test_search_respects_limit_and_min_score():
+    index = _index(["Alpha Infra", "Alpha Infra Projects", "Alpha Infrastructure", "Zeta Works"])
+    assert len(index.search("alpha infra", limit=2)) == 2
+    assert 4 not in dict(index.search("alpha infra", min_score=0.3))
+    assert index.search("") == []
+
+
+def test_exact_match_scores_one():
+    index = _index(["M/s Gupta Electricals"])
+    assert index.search("gupta electricals") == [(1, 1.0)]
+
+
+def test_add_replaces_and_remove_drops():
+    index = _index(["Old Name Works"])
+    index.add(1, "New Name Traders")
+    assert index.search("old name works", min_score=0.6) == []
+    assert index.search("new name traders")[0][0] == 1
+    index.remove(1)
+    assert len(index) == 0
+    assert index.search("new name traders") == []
@@ -0,0 +1,28 @@
+"""
+Tests for batch NIT ingestion
+"""
+
+import shutil
+import os
+
+from excel_parser import NIT_FILE_EXTENSIONS
+from nit_batch import find_nit_files, parse_nit_folder
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_files')
+
+
+def test_find_nit_files_uses_uploader_extensions(tmp_path):
+    for name in ('a.xlsx', 'b.XLSM', 'c.xls', 'd.csv', '~$a.xlsx'):
+        (tmp_path / name).write_bytes(b'')
+    found = [os.path.basename(path) for path in find_nit_files(str(tmp_path))]
+    assert found == ['a.xlsx', 'b.XLSM']
+    assert {os.path.splitext(name)[1].lower().lstrip('.') for name in found} <= set(NIT_FILE_EXTENSIONS)
+
+
+def test_parse_nit_folder_merges_works(tmp_path):
+    for name in os.listdir(TEST_FILES):
+        shutil.copy(os.path.join(TEST_FILES, name), tmp_path / name)
+    result = parse_nit_folder(str(tmp_path), max_workers=1)
+    assert result['errors'] == []
+    assert result['parsed_files'] == 2
+    assert len(result['works']) == 11
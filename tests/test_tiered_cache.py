@@ -0,0 +1,82 @@
+"""
+Tests for the shared memory + disk LRU behind NITParseCache and DocumentCache
+"""
+
+import os
+
+from document_cache import DocumentCache
+from nit_parse_cache import PARSER_VERSION, NITParseCache
+from tiered_cache import SharedInstance
+
+KEY_A, KEY_B, KEY_C = ("a" * 64, "b" * 64, "c" * 64)
+
+
+def test_memory_tier_evicts_least_recently_used_by_weight():
+    cache = DocumentCache(max_memory_bytes=10)
+    cache.put(KEY_A, b"aaaa")
+    cache.put(KEY_B, b"bbbb")
+    assert cache.get(KEY_A) == b"aaaa"  # A is now the most recent
+
+    cache.put(KEY_C, b"cccc")
+    assert cache.get(KEY_B) is None
+    assert cache.get(KEY_A) == b"aaaa"
+    assert cache.get(KEY_C) == b"cccc"
+
+    # Documents larger than the whole budget are never kept in memory
+    cache.put(KEY_B, b"x" * 11)
+    assert cache.get(KEY_B) is None
+
+
+def test_disk_tier_evicts_oldest_files_over_budget(tmp_path):
+    cache = DocumentCache(max_memory_bytes=0, cache_dir=str(tmp_path), max_disk_bytes=8)
+    cache.put(KEY_A, b"aaaa")
+    os.utime(tmp_path / f"doc_{KEY_A}.bin", (1, 1))
+    cache.put(KEY_B, b"bbbb")
+    cache.put(KEY_C, b"cccc")
+
+    assert cache.get(KEY_A) is None
+    assert cache.get(KEY_B) == b"bbbb"
+    assert cache.get(KEY_C) == b"cccc"
+
+
+def test_unreadable_disk_entry_is_discarded(tmp_path):
+    cache = NITParseCache(cache_dir=str(tmp_path))
+    path = tmp_path / f"nit_{PARSER_VERSION}_{KEY_A}.json"
+    path.write_text("{not json", encoding='utf-8')
+
+    assert cache.get(KEY_A) is None
+    assert not path.exists()
+
+
+def test_nit_results_are_private_copies_and_survive_restarts(tmp_path):
+    cache = NITParseCache(cache_dir=str(tmp_path))
+    result = {'nit_number': "12/2024", 'works': [{'item_no': "1"}]}
+    cache.put(KEY_A, result)
+    result['works'].append({'item_no': "2"})
+
+    cached = cache.get(KEY_A)
+    cached['works'].clear()
+    assert cache.get(KEY_A) == {'nit_number': "12/2024", 'works': [{'item_no': "1"}]}
+    assert NITParseCache(cache_dir=str(tmp_path)).get(KEY_A) == {'nit_number': "12/2024", 'works': [{'item_no': "1"}]}
+
+
+def test_clear_only_removes_own_files(tmp_path):
+    (tmp_path / "keep.txt").write_text("x", encoding='utf-8')
+    documents = DocumentCache(cache_dir=str(tmp_path))
+    nits = NITParseCache(cache_dir=str(tmp_path))
+    documents.put(KEY_A, b"pdf")
+    nits.put(KEY_A, {'works': []})
+
+    documents.clear()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(["keep.txt", f"nit_{PARSER_VERSION}_{KEY_A}.json"])
+    assert documents.get(KEY_A) is None
+    assert nits.get(KEY_A) == {'works': []}
+
+
+def test_shared_instance_is_built_once():
+    built = []
+    shared = SharedInstance(lambda: built.append(1) or object())
+
+    assert shared() is shared()
+    assert built == [1]
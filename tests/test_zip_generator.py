@@ -0,0 +1,188 @@
+"""
+Tests for ZipGenerator: entry types, compression policy and streaming sinks
+"""
+
+import io
+import pathlib
+import zipfile
+
+import pytest
+
+import zip_generator
+from zip_generator import ZipGenerator
+
+
+class _UnseekableSink:
+    """Write-only sink like a socket or HTTP response stream."""
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+
+    def write(self, data):
+        return self._buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return self._buffer.getvalue()
+
+
+def _read_back(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        return {info.filename: (archive.read(info), info.compress_type) for info in archive.infolist()}
+
+
+@pytest.fixture
+def entries(tmp_path):
+    source = tmp_path / "scan.pdf"
+    source.write_bytes(b"%PDF-1.4 file on disk" * 100)
+    return [
+        ('notes.tex', "\\section{Work} ₹ 1,00,000\n" * 200),
+        ('report.html', b"<p>Comparative statement</p>" * 200),
+        ('scan.pdf', pathlib.Path(source)),
+        ('upload.docx', io.BytesIO(b"PK docx payload" * 100)),
+        ('empty.txt', b""),
+    ]
+
+
+def _expected(entries):
+    expected = {}
+    for name, content in entries:
+        if isinstance(content, str):
+            expected[name] = content.encode('utf-8')
+        elif isinstance(content, pathlib.Path):
+            expected[name] = content.read_bytes()
+        elif isinstance(content, io.BytesIO):
+            expected[name] = content.getvalue()
+        else:
+            expected[name] = content
+    return expected
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+@pytest.mark.parametrize('sink_type', [io.BytesIO, _UnseekableSink])
+def test_write_zip_round_trips_every_entry_type(entries, sink_type, parallel):
+    expected = _expected(entries)
+    sink = sink_type()
+
+    assert ZipGenerator(parallel=parallel, max_workers=2).write_zip(entries, sink) == len(entries)
+
+    archive = _read_back(sink.getvalue())
+    assert list(archive) == [name for name, _ in entries]
+    assert {name: data for name, (data, _) in archive.items()} == expected
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_write_zip_to_a_path(entries, tmp_path, parallel):
+    expected = _expected(entries)
+    target = tmp_path / "out.zip"
+
+    ZipGenerator(parallel=parallel).write_zip(entries, str(target))
+
+    assert {name: data for name, (data, _) in _read_back(target.read_bytes()).items()} == expected
+
+
+@pytest.mark.parametrize('store_compressed, pdf_method', [
+    (True, zipfile.ZIP_STORED),
+    (False, zipfile.ZIP_DEFLATED),
+])
+@pytest.mark.parametrize('parallel', [False, True])
+def test_compression_policy(entries, store_compressed, pdf_method, parallel):
+    sink = io.BytesIO()
+    ZipGenerator(store_compressed=store_compressed, parallel=parallel).write_zip(entries, sink)
+
+    archive = _read_back(sink.getvalue())
+    assert archive['scan.pdf'][1] == pdf_method
+    assert archive['upload.docx'][1] == pdf_method
+    assert archive['notes.tex'][1] == zipfile.ZIP_DEFLATED
+    assert archive['report.html'][1] == zipfile.ZIP_DEFLATED
+
+
+def test_parallel_entries_match_serial_deflate_byte_for_byte():
+    documents = {f"work_{n}/statement.tex": (f"Item {n} \\\\ rate\n" * 500).encode() for n in range(20)}
+    archives = []
+    for parallel in (False, True):
+        sink = io.BytesIO()
+        ZipGenerator(parallel=parallel, max_workers=4).write_zip(documents.items(), sink)
+        with zipfile.ZipFile(io.BytesIO(sink.getvalue())) as archive:
+            archives.append([(info.filename, info.CRC, info.compress_size) for info in archive.infolist()])
+
+    assert archives[0] == archives[1]
+
+
+@pytest.mark.parametrize('use_streams', [False, True])
+def test_parallel_writer_switches_to_zip64(monkeypatch, use_streams):
+    # Lower the limits so the ZIP64 records are exercised without 4 GiB of data
+    monkeypatch.setattr(zip_generator, '_ZIP64_LIMIT', 1000)
+    monkeypatch.setattr(zip_generator, '_ZIP_FILECOUNT_LIMIT', 3)
+    content = bytes(range(256)) * 8
+    entries = [(f"part_{n}.bin", io.BytesIO(content) if use_streams else content) for n in range(5)]
+    sink = io.BytesIO()
+
+    ZipGenerator(parallel=True).write_zip(entries, sink)
+
+    archive = _read_back(sink.getvalue())
+    assert {name: data for name, (data, _) in archive.items()} == {f"part_{n}.bin": content for n in range(5)}
+
+
+def test_parallel_writer_marks_utf8_names():
+    sink = io.BytesIO()
+    ZipGenerator(parallel=True).write_zip([('निविदा/README.txt', b"text")], sink)
+
+    with zipfile.ZipFile(io.BytesIO(sink.getvalue())) as archive:
+        info = archive.infolist()[0]
+        assert info.filename == 'निविदा/README.txt'
+        assert info.flag_bits & 0x800
+
+
+def test_create_zip_file_removes_the_file_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+
+    def broken():
+        yield 'a.txt', b"a"
+        raise RuntimeError("render failed")
+
+    with pytest.raises(RuntimeError):
+        ZipGenerator().create_zip_file(broken())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_tender_documents_zip_naming():
+    data = ZipGenerator().create_tender_documents_zip(
+        "CC road", "12-2024", {'work_order': b"%PDF wo", 'bill': b"%PDF bill"})
+
+    archive = _read_back(data)
+    assert list(archive) == [
+        'NIT_12-2024_Documents/Work_Order_12-2024.pdf',
+        'NIT_12-2024_Documents/bill_12-2024.pdf',
+        'NIT_12-2024_Documents/README.txt',
+    ]
+    readme = archive['NIT_12-2024_Documents/README.txt'][0].decode('utf-8')
+    assert "Work Name: CC road" in readme
+    assert "- Work Order\n- Bill\n" in readme
+
+
+def test_str_content_is_text_and_path_content_is_the_file(tmp_path):
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF file on disk")
+    sink = io.BytesIO()
+
+    ZipGenerator().write_zip([('note.txt', "plain text ₹"), ('report.pdf', pathlib.Path(source))], sink)
+
+    archive = _read_back(sink.getvalue())
+    assert archive['note.txt'][0] == "plain text ₹".encode('utf-8')
+    assert archive['report.pdf'][0] == b"%PDF file on disk"
+
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_str_content_is_never_read_as_a_path(tmp_path, monkeypatch, parallel):
+    (tmp_path / "README.md").write_bytes(b"file contents")
+    monkeypatch.chdir(tmp_path)
+    sink = io.BytesIO()
+
+    ZipGenerator(parallel=parallel).write_zip([('notes.txt', "README.md")], sink)
+
+    assert _read_back(sink.getvalue())['notes.txt'][0] == b"README.md"
@@ -0,0 +1,168 @@
+"""
+Tiered Cache for Tender Processing System
+Memory LRU in front of an optional size-bounded disk LRU, shared by the NIT
+parse cache and the document cache
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class TieredCache:
+    """
+    Two-tier (memory LRU + optional disk LRU) cache keyed by hex digests.
+
+    Subclasses name their files (file_prefix/file_suffix), describe their
+    entries in log messages (label) and convert values to and from bytes
+    (_encode/_decode). The memory tier holds at most max_memory units as
+    measured by _weight (1 per entry by default).
+    """
+
+    label = 'cache'
+    file_prefix = 'entry_'
+    file_suffix = '.bin'
+
+    def __init__(self, max_memory: int, cache_dir: Optional[str] = None, max_disk_bytes: int = 0):
+        """
+        Args:
+            max_memory: Memory budget in _weight units
+            cache_dir: Directory for the on-disk tier; None disables it
+            max_disk_bytes: Size budget for the on-disk tier
+        """
+        self.max_memory = max_memory
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _weight(self, value: Any) -> int:
+        return 1
+
+    def _encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def _decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.file_prefix}{key}{self.file_suffix}")
+
+    def _is_entry_file(self, name: str) -> bool:
+        return name.startswith(self.file_prefix) and name.endswith(self.file_suffix)
+
+    def _remember(self, key: str, value: Any) -> None:
+        weight = self._weight(value)
+        if weight > self.max_memory:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= self._weight(previous)
+            self._memory[key] = value
+            self._memory_used += weight
+            while self._memory_used > self.max_memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= self._weight(evicted)
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """Return the stored value for key (not a copy), or None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = self._decode(f.read())
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable {self.label} entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def _store(self, key: str, value: Any) -> None:
+        """Keep value under key in memory and, if enabled, on disk."""
+        self._remember(key, value)
+
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self._encode(value))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.warning(f"Could not write {self.label} entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def clear(self) -> None:
+        """Drop every cached entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+        if self.cache_dir:
+            for entry in os.scandir(self.cache_dir):
+                if self._is_entry_file(entry.name):
+                    self._remove(entry.path)
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used disk entries until under max_disk_bytes."""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.cache_dir)
+                if self._is_entry_file(entry.name)
+            ]
+        except OSError as e:
+            logging.warning(f"Could not scan {self.label} directory: {e}")
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SharedInstance(Generic[T]):
+    """Process-wide instance shared by all Streamlit sessions, built on first use."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
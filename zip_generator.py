@@ -5,14 +5,359 @@ Creates ZIP archives containing multiple documents
 
 import zipfile
 import io
-from typing import Dict
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
 
+# Content of one archive entry: raw bytes, text (stored as UTF-8, as
+# ZipFile.writestr does), a path to a file on disk, or a readable binary file
+# object. Paths must be os.PathLike (e.g. pathlib.Path): a plain str is
+# always text.
+EntryContent = Union[bytes, str, os.PathLike, BinaryIO]
+
+# Chunk size used when copying file entries into the archive
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Formats that are already compressed internally; deflating them again makes
+# the archive several times slower to build for a few percent of size, so
+# they are stored as-is
+STORED_EXTENSIONS = frozenset({
+    '.pdf', '.docx', '.xlsx', '.pptx', '.png', '.jpg', '.jpeg', '.gif', '.zip', '.gz'
+})
+
+# zlib level used for text entries (.tex, .html, README, ...): 1 is fastest, 9 smallest
+DEFAULT_COMPRESSLEVEL = 6
+
+# Document type to filename mapping for tender document packages
+TENDER_DOCUMENT_NAMES = {
+    'comparative_statement': 'Comparative_Statement',
+    'letter_acceptance': 'Letter_of_Acceptance',
+    'scrutiny_sheet': 'Scrutiny_Sheet',
+    'work_order': 'Work_Order'
+}
+
+
+def _deflate(data: bytes, compresslevel: int) -> Tuple[int, bytes]:
+    """Return the CRC-32 and raw deflate stream of data (zlib releases the GIL for both)."""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    return zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+
+def _store(data: bytes) -> Tuple[int, bytes]:
+    """Return the CRC-32 of data and data itself, for entries kept uncompressed."""
+    return zlib.crc32(data), data
+
+
+# ZIP records (PKWARE APPNOTE.TXT section 4.3) written by _ArchiveWriter
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_DATA_DESCRIPTOR = struct.Struct('<4s3L')
+_DATA_DESCRIPTOR64 = struct.Struct('<4sL2Q')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_END_RECORD64 = struct.Struct('<4sQ2H2L4Q')
+_END_LOCATOR64 = struct.Struct('<4sLQL')
+
+# Field values above these limits move to the ZIP64 extra field
+_ZIP64_LIMIT = zipfile.ZIP64_LIMIT
+_ZIP_FILECOUNT_LIMIT = zipfile.ZIP_FILECOUNT_LIMIT
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+# Version made by: 2.0 on a Unix host (3), as ZipFile.writestr records it
+_VERSION_MADE_BY = (3 << 8) | 20
+
+
+class _ArchiveWriter:
+    """
+    Append-only ZIP writer for entries whose contents arrive in input order.
+    
+    Local headers and data are written strictly forwards while offsets, CRCs
+    and sizes are tracked here, so the sink never needs to be seekable; the
+    central directory and end records are assembled in close. Only public
+    zlib/struct APIs are used, which lets entries be deflated elsewhere (in a
+    thread pool) and written with their CRC and sizes already known.
+    """
+    
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self.offset = 0
+        self._central: List[bytes] = []
+    
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+        self.offset += len(data)
+    
+    @staticmethod
+    def _encode_name(filename: str) -> Tuple[bytes, int]:
+        try:
+            return filename.encode('ascii'), 0
+        except UnicodeEncodeError:
+            return filename.encode('utf-8'), _FLAG_UTF8
+    
+    @staticmethod
+    def _dos_date_time() -> Tuple[int, int]:
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+    
+    def _local_header(self, name: bytes, flags: int, method: int, dos_time: int, dos_date: int,
+                      crc: int, compress_size: int, file_size: int, zip64: bool) -> None:
+        extra = b''
+        if zip64:
+            extra = struct.pack('<2H2Q', 1, 16, file_size, compress_size)
+            compress_size = file_size = 0xFFFFFFFF
+        self._write(_LOCAL_HEADER.pack(b'PK\x03\x04', 45 if zip64 else 20, flags, method, dos_time, dos_date,
+                                       crc, compress_size, file_size, len(name), len(extra)))
+        self._write(name)
+        self._write(extra)
+    
+    def _central_record(self, name: bytes, flags: int, method: int, dos_time: int, dos_date: int,
+                        crc: int, compress_size: int, file_size: int, header_offset: int) -> None:
+        fields = []
+        if file_size > _ZIP64_LIMIT:
+            fields.append(file_size)
+            file_size = 0xFFFFFFFF
+        if compress_size > _ZIP64_LIMIT:
+            fields.append(compress_size)
+            compress_size = 0xFFFFFFFF
+        if header_offset > _ZIP64_LIMIT:
+            fields.append(header_offset)
+            header_offset = 0xFFFFFFFF
+        extra = struct.pack(f'<2H{len(fields)}Q', 1, 8 * len(fields), *fields) if fields else b''
+        self._central.append(
+            _CENTRAL_HEADER.pack(b'PK\x01\x02', _VERSION_MADE_BY, 45 if fields else 20, flags, method,
+                                 dos_time, dos_date, crc, compress_size, file_size, len(name), len(extra),
+                                 0, 0, 0, 0o600 << 16, header_offset)
+            + name + extra
+        )
+    
+    def add(self, filename: str, method: int, crc: int, file_size: int, payload: bytes) -> None:
+        """Append an entry whose CRC, size and (compressed) payload are already known."""
+        name, flags = self._encode_name(filename)
+        dos_time, dos_date = self._dos_date_time()
+        header_offset = self.offset
+        zip64 = file_size > _ZIP64_LIMIT or len(payload) > _ZIP64_LIMIT
+        self._local_header(name, flags, method, dos_time, dos_date, crc, len(payload), file_size, zip64)
+        self._write(payload)
+        self._central_record(name, flags, method, dos_time, dos_date, crc, len(payload), file_size, header_offset)
+    
+    def add_stream(self, filename: str, method: int, source: BinaryIO, compresslevel: int) -> None:
+        """
+        Append an entry copied from a readable file in COPY_CHUNK_SIZE chunks.
+        
+        The CRC and sizes are only known at the end, so they follow the data
+        in a data descriptor, as ZipFile.open(..., 'w') does on unseekable sinks.
+        """
+        name, flags = self._encode_name(filename)
+        flags |= _FLAG_DATA_DESCRIPTOR
+        dos_time, dos_date = self._dos_date_time()
+        header_offset = self.offset
+        try:
+            position = source.tell()
+            expected_size = source.seek(0, io.SEEK_END) - position
+            source.seek(position)
+        except (AttributeError, OSError, ValueError):
+            expected_size = 0  # unseekable source: size unknown until the end
+        # Deflate can grow incompressible data slightly, hence the margin
+        zip64 = expected_size * 1.05 > _ZIP64_LIMIT
+        self._local_header(name, flags, method, dos_time, dos_date, 0, 0, 0, zip64)
+        
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15) if method == zipfile.ZIP_DEFLATED else None
+        crc = file_size = compress_size = 0
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            data = compressor.compress(chunk) if compressor else chunk
+            compress_size += len(data)
+            self._write(data)
+        if compressor:
+            data = compressor.flush()
+            compress_size += len(data)
+            self._write(data)
+        
+        if zip64:
+            self._write(_DATA_DESCRIPTOR64.pack(b'PK\x07\x08', crc, compress_size, file_size))
+        elif file_size > _ZIP64_LIMIT or compress_size > _ZIP64_LIMIT:
+            # Same limitation (and message) as zipfile without force_zip64
+            raise RuntimeError(f"File size too large for {filename!r}, try using force_zip64")
+        else:
+            self._write(_DATA_DESCRIPTOR.pack(b'PK\x07\x08', crc, compress_size, file_size))
+        self._central_record(name, flags, method, dos_time, dos_date, crc, compress_size, file_size, header_offset)
+    
+    def close(self) -> None:
+        """Write the central directory and end of central directory records."""
+        start = self.offset
+        for record in self._central:
+            self._write(record)
+        size = self.offset - start
+        count = len(self._central)
+        if count > _ZIP_FILECOUNT_LIMIT or start > _ZIP64_LIMIT or size > _ZIP64_LIMIT:
+            end64 = self.offset
+            self._write(_END_RECORD64.pack(b'PK\x06\x06', _END_RECORD64.size - 12, _VERSION_MADE_BY, 45,
+                                           0, 0, count, count, size, start))
+            self._write(_END_LOCATOR64.pack(b'PK\x06\x07', 0, end64, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start = min(start, 0xFFFFFFFF)
+        self._write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, count, count, size, start, 0))
+        self.fp.flush()
+
+
 class ZipGenerator:
     """Generates ZIP archives containing multiple documents."""
     
-    def __init__(self):
-        pass
+    def __init__(self, compresslevel: int = DEFAULT_COMPRESSLEVEL, store_compressed: bool = True,
+                 parallel: bool = False, max_workers: Optional[int] = None):
+        """
+        Args:
+            compresslevel: zlib level (0-9) for deflated entries
+            store_compressed: Store STORED_EXTENSIONS entries instead of deflating them
+            parallel: Deflate bytes/text entries concurrently in a thread pool
+            max_workers: Compression threads for parallel mode (defaults to the CPU count)
+        """
+        self.compresslevel = compresslevel
+        self.store_compressed = store_compressed
+        self.parallel = parallel
+        self.max_workers = max_workers
+    
+    def compression_for(self, filename: str) -> int:
+        """Return the zipfile compression method for an entry name."""
+        if self.store_compressed and os.path.splitext(filename)[1].lower() in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+    
+    def write_zip(self, entries: Iterable[Tuple[str, EntryContent]],
+                  sink: Union[str, os.PathLike, BinaryIO]) -> int:
+        """
+        Stream entries into a ZIP archive written to sink.
+        
+        Entries are consumed one at a time and file contents are copied in
+        chunks, so memory use stays bounded by the largest bytes entry rather
+        than the whole archive. The sink does not need to be seekable. Each
+        entry is stored or deflated according to compression_for; in parallel
+        mode the deflating runs in a thread pool and the archive is written
+        by _ArchiveWriter instead of zipfile.
+        
+        Args:
+            entries: Iterable of (archive name, content) pairs; see EntryContent
+                (a str is always text; pass file paths as pathlib.Path)
+            sink: Path or writable binary file object (file, socket file, ...)
+            
+        Returns:
+            Number of entries written
+        """
+        if self.parallel:
+            if isinstance(sink, (str, os.PathLike)):
+                with open(sink, 'wb') as fp:
+                    return self._write_parallel(entries, fp)
+            return self._write_parallel(entries, sink)
+        
+        count = 0
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel) as zip_file:
+            for filename, content in entries:
+                self._write_entry(zip_file, filename, content)
+                count += 1
+        return count
+    
+    def _write_entry(self, zip_file: zipfile.ZipFile, filename: str, content: EntryContent) -> None:
+        """Write one entry through ZipFile's public writestr/open API."""
+        compress_type = self.compression_for(filename)
+        if isinstance(content, str):
+            zip_file.writestr(filename, content.encode('utf-8'), compress_type=compress_type)
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            zip_file.writestr(filename, bytes(content), compress_type=compress_type)
+        else:
+            target_info = filename
+            if compress_type == zipfile.ZIP_STORED:
+                target_info = zipfile.ZipInfo(filename, time.localtime()[:6])
+                target_info.compress_type = zipfile.ZIP_STORED
+                target_info.external_attr = 0o600 << 16
+            if isinstance(content, os.PathLike):
+                with open(content, 'rb') as source, zip_file.open(target_info, 'w') as target:
+                    shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+            else:
+                with zip_file.open(target_info, 'w') as target:
+                    shutil.copyfileobj(content, target, COPY_CHUNK_SIZE)
+    
+    def _write_parallel(self, entries: Iterable[Tuple[str, EntryContent]], sink: BinaryIO) -> int:
+        """
+        Deflate bytes/text entries in a thread pool and append them in input order.
+        
+        At most two entries per thread are in flight, so memory stays bounded
+        as in the serial path. File entries are copied in chunks on this
+        thread when their turn comes.
+        """
+        writer = _ArchiveWriter(sink)
+        workers = self.max_workers or os.cpu_count() or 1
+        window: Deque[Tuple[str, Any, Optional[Future]]] = deque()
+        count = 0
+        
+        def flush() -> None:
+            filename, content, future = window.popleft()
+            method = self.compression_for(filename)
+            if future is None:
+                if isinstance(content, os.PathLike):
+                    with open(content, 'rb') as source:
+                        writer.add_stream(filename, method, source, self.compresslevel)
+                else:
+                    writer.add_stream(filename, method, content, self.compresslevel)
+                return
+            crc, payload = future.result()
+            writer.add(filename, method, crc, content, payload)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for filename, content in entries:
+                if isinstance(content, str):
+                    content = content.encode('utf-8')
+                if isinstance(content, (bytes, bytearray, memoryview)):
+                    content = bytes(content)
+                    if self.compression_for(filename) == zipfile.ZIP_DEFLATED:
+                        future = executor.submit(_deflate, content, self.compresslevel)
+                    else:
+                        future = executor.submit(_store, content)
+                    # Only the size is needed once the worker has the data
+                    window.append((filename, len(content), future))
+                else:
+                    window.append((filename, content, None))
+                count += 1
+                while len(window) > 2 * workers:
+                    flush()
+            while window:
+                flush()
+        writer.close()
+        return count
+    
+    def create_zip_file(self, entries: Iterable[Tuple[str, EntryContent]],
+                        prefix: str = "tender_documents_") -> str:
+        """
+        Stream entries into a temporary ZIP file.
+        
+        Args:
+            entries: Iterable of (archive name, content) pairs
+            prefix: Temporary file name prefix
+            
+        Returns:
+            Path of the ZIP file; the caller removes it once it has been served
+            (e.g. with app.read_and_remove before st.download_button)
+        """
+        fd, path = tempfile.mkstemp(prefix=prefix, suffix='.zip')
+        try:
+            with os.fdopen(fd, 'wb') as sink:
+                count = self.write_zip(entries, sink)
+        except Exception:
+            os.remove(path)
+            raise
+        logging.info(f"Created ZIP archive {path} with {count} files")
+        return path
     
     def create_zip(self, documents: Dict[str, bytes]) -> bytes:
         """
@@ -26,59 +371,30 @@ class ZipGenerator:
         """
         try:
             zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for filename, content in documents.items():
-                    zip_file.writestr(filename, content)
-            
-            zip_data = zip_buffer.getvalue()
-            zip_buffer.close()
+            self.write_zip(documents.items(), zip_buffer)
             
             logging.info(f"Created ZIP archive with {len(documents)} files")
-            return zip_data
+            return zip_buffer.getvalue()
             
         except Exception as e:
             logging.error(f"Error creating ZIP archive: {e}")
             return b""
     
-    def create_tender_documents_zip(self, work_name: str, nit_number: str, 
-                                   documents: Dict[str, bytes]) -> bytes:
+    def iter_tender_document_entries(self, work_name: str, nit_number: str,
+                                     documents: Iterable[Tuple[str, EntryContent]]) -> Iterator[Tuple[str, EntryContent]]:
         """
-        Create a ZIP file specifically for tender documents with organized naming.
+        Yield the archive entries of a tender documents package, README last.
         
         Args:
-            work_name: Name of the work for folder organization
-            nit_number: NIT number for file naming
-            documents: Dictionary with document type as key and PDF content as value
-            
-        Returns:
-            ZIP file content as bytes
+            work_name: Name of the work for the README
+            nit_number: NIT number for folder and file naming
+            documents: Iterable of (document type, PDF content) pairs
         """
-        try:
-            zip_buffer = io.BytesIO()
-            
-            # Document type to filename mapping
-            doc_names = {
-                'comparative_statement': 'Comparative_Statement',
-                'letter_acceptance': 'Letter_of_Acceptance',
-                'scrutiny_sheet': 'Scrutiny_Sheet',
-                'work_order': 'Work_Order'
-            }
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # Create a folder structure
-                folder_name = f"NIT_{nit_number}_Documents"
-                
-                for doc_type, content in documents.items():
-                    if doc_type in doc_names:
-                        filename = f"{folder_name}/{doc_names[doc_type]}_{nit_number}.pdf"
-                    else:
-                        filename = f"{folder_name}/{doc_type}_{nit_number}.pdf"
-                    
-                    zip_file.writestr(filename, content)
-                
-                # Add a readme file with document information
-                readme_content = f"""Tender Documents Package
+        # Create a folder structure
+        folder_name = f"NIT_{nit_number}_Documents"
+        
+        # Add a readme file with document information
+        readme_content = f"""Tender Documents Package
 ===========================
 
 Work Name: {work_name}
@@ -87,25 +403,145 @@ Generated on: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S
 
 This package contains the following documents:
 """
-                
-                for doc_type in documents.keys():
-                    if doc_type in doc_names:
-                        readme_content += f"- {doc_names[doc_type].replace('_', ' ')}\n"
-                    else:
-                        readme_content += f"- {doc_type.replace('_', ' ').title()}\n"
-                
-                readme_content += f"""
+        
+        for doc_type, content in documents:
+            if doc_type in TENDER_DOCUMENT_NAMES:
+                filename = f"{folder_name}/{TENDER_DOCUMENT_NAMES[doc_type]}_{nit_number}.pdf"
+                readme_content += f"- {TENDER_DOCUMENT_NAMES[doc_type].replace('_', ' ')}\n"
+            else:
+                filename = f"{folder_name}/{doc_type}_{nit_number}.pdf"
+                readme_content += f"- {doc_type.replace('_', ' ').title()}\n"
+            
+            yield filename, content
+        
+        readme_content += f"""
 Generated by Enhanced Tender Processing System
 """
-                
-                zip_file.writestr(f"{folder_name}/README.txt", readme_content.encode('utf-8'))
+        
+        yield f"{folder_name}/README.txt", readme_content
+    
+    def create_tender_documents_zip(self, work_name: str, nit_number: str, 
+                                   documents: Dict[str, bytes]) -> bytes:
+        """
+        Create a ZIP file specifically for tender documents with organized naming.
+        
+        Args:
+            work_name: Name of the work for folder organization
+            nit_number: NIT number for file naming
+            documents: Dictionary with document type as key and PDF content as value
             
-            zip_data = zip_buffer.getvalue()
-            zip_buffer.close()
+        Returns:
+            ZIP file content as bytes
+        """
+        try:
+            zip_buffer = io.BytesIO()
+            self.write_zip(self.iter_tender_document_entries(work_name, nit_number, documents.items()), zip_buffer)
             
             logging.info(f"Created organized ZIP archive for NIT {nit_number} with {len(documents)} documents")
-            return zip_data
+            return zip_buffer.getvalue()
             
         except Exception as e:
             logging.error(f"Error creating tender documents ZIP: {e}")
             return b""
+    
+    def create_tender_documents_zip_file(self, work_name: str, nit_number: str,
+                                        documents: Iterable[Tuple[str, EntryContent]]) -> str:
+        """
+        Stream a tender documents package into a temporary ZIP file.
+        
+        Args:
+            work_name: Name of the work for the README
+            nit_number: NIT number for folder and file naming
+            documents: Iterable of (document type, PDF content) pairs
+            
+        Returns:
+            Path of the ZIP file; the caller removes it once it has been served
+        """
+        return self.create_zip_file(self.iter_tender_document_entries(work_name, nit_number, documents))
+
+
+def benchmark_compression(documents: Dict[str, bytes], levels: Iterable[int] = (1, 6, 9),
+                          parallel: Iterable[bool] = (False,)) -> List[Dict[str, Any]]:
+    """
+    Time archiving a bundle with and without the store policy at each level.
+    
+    Args:
+        documents: Archive name -> content of a representative bundle
+        levels: zlib levels to try
+        parallel: Serial and/or parallel deflate modes to try
+        
+    Returns:
+        One dict per run with 'policy', 'level', 'parallel', 'seconds' and 'bytes'
+    """
+    results = []
+    for level in levels:
+        for mode in parallel:
+            for policy, store_compressed in (('deflate all', False), ('store compressed', True)):
+                generator = ZipGenerator(compresslevel=level, store_compressed=store_compressed, parallel=mode)
+                sink = io.BytesIO()
+                start = time.perf_counter()
+                generator.write_zip(documents.items(), sink)
+                results.append({
+                    'policy': policy,
+                    'level': level,
+                    'parallel': mode,
+                    'seconds': time.perf_counter() - start,
+                    'bytes': sink.tell(),
+                })
+    return results
+
+
+if __name__ == "__main__":
+    # Benchmark on a realistic bundle: the PDF, DOCX, LaTeX and HTML outputs
+    # of a multi-work NIT
+    from document_generator import DocumentGenerator
+    from latex_generator import LaTeXGenerator
+    from pdf_generator import PDFGenerator
+    from report_generator import ReportGenerator
+    from template_registry import get_template_registry
+    
+    registry = get_template_registry()
+    pdf_gen, doc_gen, latex_gen, report_gen = PDFGenerator(), DocumentGenerator(), LaTeXGenerator(), ReportGenerator()
+    bundle: Dict[str, bytes] = {}
+    for item_no in range(1, 11):
+        estimated_cost = 250000.0 * item_no
+        work = {
+            'work_name': f"Construction of CC road and drain, ward {item_no}",
+            'nit_number': '12/2024-25',
+            'work_info': {
+                'estimated_cost': estimated_cost,
+                'earnest_money': estimated_cost * 0.02,
+                'time_of_completion': '6 Months',
+                'date': '15-04-2024',
+                'nit_number': '12/2024-25',
+            },
+        }
+        bidders = [
+            {
+                'name': f"Bidder {n} Constructions",
+                'address': f"{n} Industrial Area, Udaipur",
+                'percentage': percentage,
+                'bid_amount': round(estimated_cost * (1 + percentage / 100), 2),
+                'earnest_money': estimated_cost * 0.02,
+            }
+            for n, percentage in enumerate((-4.5, -2.0, 1.25, 3.0, 5.5), start=1)
+        ]
+        folder = f"Work_{item_no}"
+        for stem in ('comparative_statement', 'scrutiny_sheet', 'letter_of_acceptance', 'work_order'):
+            bundle[f"{folder}/{stem}.pdf"] = getattr(pdf_gen, f"generate_{stem}_pdf")(work, bidders)
+            bundle[f"{folder}/{stem}.docx"] = getattr(doc_gen, f"generate_{stem}_doc")(work, bidders)
+        template_data = latex_gen.prepare_template_data(work, bidders)
+        for template in registry.names():
+            bundle[f"{folder}/{os.path.splitext(template)[0]}.tex"] = \
+                registry.get(template).render(template_data).encode('utf-8')
+        bundle[f"{folder}/report.html"] = report_gen.generate_detailed_report(work, bidders).encode('utf-8')
+    bundle['README.txt'] = b"Benchmark bundle\n"
+    
+    text_bundle = {name: content for name, content in bundle.items() if name.endswith(('.tex', '.html'))}
+    for title, documents in (('Full bundle', bundle), ('Text-only bundle', text_bundle)):
+        raw = sum(len(content) for content in documents.values())
+        print(f"{title}: {len(documents)} entries, {raw / 1024:.0f} KiB uncompressed, {os.cpu_count()} CPUs")
+        for result in benchmark_compression(documents, parallel=(False, True)):
+            print(f"  {result['policy']:<17} level {result['level']} "
+                  f"{'parallel' if result['parallel'] else 'serial':<8}: "
+                  f"{result['seconds'] * 1000:7.1f} ms  {result['bytes'] / 1024:8.0f} KiB")